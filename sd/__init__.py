@@ -1,78 +1,133 @@
+from __future__ import annotations
+
 import abc
-import builtins
+import concurrent.futures
 import dataclasses
+import functools
 import math
 import os
 import statistics
-import tomllib
+import timeit
 import typing
 
-import arrow
-import matplotlib.collections
-import matplotlib.container
-import matplotlib.patches
-import matplotlib.pyplot as plt
-import matplotlib.text
 import numpy as np
 import numpy.random
 import simpy
 import simpy.events
+import simpy.resources.base
 import simpy.resources.store
 
+# O `matplotlib` é importado apenas quando necessário, já que a maior parte
+# das execuções sem gráficos não depende dele e a sua importação é lenta
+if typing.TYPE_CHECKING:
+    import matplotlib.collections
+    import matplotlib.patches
+    import matplotlib.pyplot as plt
+    import matplotlib.text
+    import matplotlib.transforms
+
 Generator = typing.Generator[simpy.Event, typing.Any, typing.Any]
 
 
+def _fmt_unidade_tempo(valor: int, singular: str, plural: str) -> str:
+    return singular if valor == 1 else f'{valor} {plural}'
+
+
 def _fmt_tempo(delta: float, time_unit: typing.Literal['horas', 'minutos']) -> str:
-    dt = arrow.utcnow()
+    # Mesmo texto produzido por `arrow` (`humanize(locale='pt', only_distance=True, granularity=['hour',
+    # 'minute', 'second'])`), mas calculado diretamente, sem construir datas nem consultar a localização
     match time_unit:
         case 'horas':
-            dt = dt.shift(hours=delta)
+            total_segundos = round(abs(float(delta)) * 3600)
         case 'minutos':
-            dt = dt.shift(minutes=delta)
-    return dt.humanize(locale='pt', only_distance=True, granularity=['hour', 'minute', 'second'])
+            total_segundos = round(abs(float(delta)) * 60)
+    horas, resto = divmod(total_segundos, 3600)
+    minutos, segundos = divmod(resto, 60)
+
+    texto_horas = _fmt_unidade_tempo(horas, 'uma hora', 'horas')
+    texto_minutos = _fmt_unidade_tempo(minutos, 'um minuto', 'minutos')
+    texto_segundos = _fmt_unidade_tempo(segundos, 'um segundo', 'segundos')
+    return f'{texto_horas} {texto_minutos} e {texto_segundos}'
 
 
 @dataclasses.dataclass(kw_only=True)
 class InteractiveState:
     figure: plt.Figure
+    axes: list[plt.Axes]
     subtitle_text: matplotlib.text.Text
     current_rects: list[matplotlib.patches.Rectangle]
     current_rects_labels: list[matplotlib.text.Annotation]
     max_rects: list[matplotlib.collections.LineCollection]
+    # Vértices de cada `max_rect`, compartilhados com o `Path` desenhado e alterados no lugar
+    max_segments: list[np.ndarray]
+    # Fundos estáticos capturados após um `canvas.draw()` completo, usados para blitting
+    backgrounds: list[typing.Any] = dataclasses.field(default_factory=list)
+    subtitle_bbox: matplotlib.transforms.Bbox | None = None
+    subtitle_background: typing.Any = None
 
 
 def entrypoint[R](f: typing.Callable[..., R]) -> typing.Callable[..., R]:
+    name = f.__name__
+    # Resolvido na primeira chamada, evitando reflexão sobre a classe a cada entidade criada
+    entrypoints: dict[str, int] | None = None
+
     def m(self, *args, **kwargs) -> R:
-        cls = type(self)
-        entrypoints = getattr(cls, '__entrypoints', {})
-        entrypoints[f.__name__] = entrypoints.get(f.__name__, 0) + 1
-        setattr(cls, '__entrypoints', entrypoints)
+        nonlocal entrypoints
+        if entrypoints is None:
+            cls = type(self)
+            entrypoints = getattr(cls, '__entrypoints', None)
+            if entrypoints is None:
+                entrypoints = {}
+                setattr(cls, '__entrypoints', entrypoints)
+            entrypoints.setdefault(name, 0)
+
+        entrypoints[name] += 1
         return f(self, *args, **kwargs)
 
     return m
 
 
 def load_figure(title: str, values: list[tuple[str, int, int]]) -> InteractiveState:
+    import matplotlib.pyplot as plt
+
     colors = ('#19d228', '#b4dd1e', '#f4fb16', '#f6d32b', '#fb7116')
+    # Faixas de fundo [0, 2), [2, 4), ..., [8, 10), com a mesma altura padrão de `barh`
+    color_ranges = [(left, 2) for left in range(0, 10, 2)]
+    xticks = range(0, 11)
+    xlabels = [f'{i}%' for i in range(0, 101, 10)]
 
+    axes: list[plt.Axes] = []
     current_rects: list[matplotlib.patches.Rectangle] = []
     current_rects_labels: list[matplotlib.text.Annotation] = []
     max_rects: list[matplotlib.collections.LineCollection] = []
-    fig, axs = plt.subplots(len(values), 1, figsize=(20, 4))
+    max_segments: list[np.ndarray] = []
+    fig, axs = plt.subplots(len(values), 1, figsize=(20, 4), squeeze=False)
     for i, (label, current, count) in enumerate(values):
-        ax = axs[i]
-        ax.barh(y=[0, 0, 0, 0, 0], width=[2, 2, 2, 2, 2], left=[0, 2, 4, 6, 8], color=colors)
+        ax = axs[i, 0]
+        axes.append(ax)
+        # Uma única coleção para as cinco faixas, em vez de um retângulo por faixa
+        ax.broken_barh(color_ranges, (-0.4, 0.8), facecolors=colors)
 
+        # Artistas atualizados a cada evento são marcados como animados para não
+        # serem desenhados pelo `canvas.draw()`, apenas via blitting
         current_bar = ax.barh(y=[0], width=[6.5], color='black', height=0.4)
         current_rect, = current_bar
+        current_rect.set_animated(True)
         current_rects.append(current_rect)
         current_rect_label, = ax.bar_label(current_bar, label_type='center', color='white')
+        current_rect_label.set_animated(True)
         current_rects_labels.append(current_rect_label)
 
         max_rect = ax.vlines(x=10 * current / count, ymin=-0.2, ymax=0.2, color='blue', linewidth=5)
+        max_rect.set_animated(True)
+        # Um segmento vertical [(x, -0.2), (x, 0.2)]: como o array já é `float64`, o `Path`
+        # criado por `set_segments` reutiliza sua memória e basta alterá-lo no lugar depois
+        max_segment = np.array([[[10 * current / count, -0.2], [10 * current / count, 0.2]]])
+        max_rect.set_segments(max_segment)
         max_rects.append(max_rect)
+        max_segments.append(max_segment)
 
-        ax.set_xticks(range(0, 11), ['{}%'.format(i) for i in range(0, 101, 10)])
+        ax.set_xticks(xticks, xlabels)
         ax.set_yticks([0], [label], fontsize=16, fontweight='bold')
         ax.spines[['bottom', 'top', 'left', 'right']].set_visible(False)
         if i == 0:
@@ -80,16 +135,30 @@ def load_figure(title: str, values: list[tuple[str, int, int]]) -> InteractiveSt
         if i == len(values) - 1:
             ax.set_xlabel('Uso (%)', fontsize=16, fontweight='bold')
 
-    subtitle_text = fig.text(0.35, 0.93, 'nº clientes = 0')
+    subtitle_text = fig.text(0.35, 0.93, 'nº clientes = 0', animated=True)
     return InteractiveState(
         figure=fig,
+        axes=axes,
         subtitle_text=subtitle_text,
         current_rects=current_rects,
         current_rects_labels=current_rects_labels,
         max_rects=max_rects,
+        max_segments=max_segments,
     )
 
 
+def _resource_reader(field_name: str, field_value: typing.Any) -> typing.Callable[[], tuple[int, int]]:
+    match field_value:
+        case simpy.Store():
+            return lambda: (field_value.capacity - len(field_value.items), field_value.capacity)
+        case simpy.Container():
+            return lambda: (field_value.level, field_value.capacity)
+        case simpy.Resource():
+            return lambda: (field_value.count, field_value.capacity)
+        case _:
+            raise ValueError(f'{field_name}: unsupported resource type: {field_value}')
+
+
 class BaseEnvironment(simpy.Environment, abc.ABC):
     @abc.abstractmethod
     def on_event(
@@ -104,12 +173,6 @@ class BaseEnvironment(simpy.Environment, abc.ABC):
     def close(self) -> None:
         pass
 
-    def step(self) -> None:
-        if self._queue:
-            time, priority, event_id, event = self._queue[0]
-            self.on_event(time, priority, event_id, event)
-        return super().step()
-
 
 class Environment(BaseEnvironment):
 
@@ -126,27 +189,99 @@ class Environment(BaseEnvironment):
 
 class InteractiveEnvironment[M](BaseEnvironment):
     __m: M
+    __resource_items: list[tuple[str, 'RecursoModelo']]
+    __entrypoints: dict[str, int]
+    __entrypoint_key: str
+    __plot_title: str
+    __readers: list[tuple[str, typing.Callable[[], tuple[int, int]]]] | None
+    __resource_index: dict[typing.Any, int]
     __state: InteractiveState | None
-    __maxs: dict[int, float]
-
-    def __init__(self, m: M, initial_time: int = 0, fast_forward: bool = False) -> None:
+    __currents: np.ndarray
+    __totals: np.ndarray
+    __usages: np.ndarray
+    __maxs: np.ndarray
+    __last_draw: float
+    __min_interval: float
+    __dirty: bool
+    __dirty_indices: set[int]
+
+    def __init__(
+            self,
+            m: M,
+            initial_time: int = 0,
+            fast_forward: bool = False,
+            min_interval: float = 1 / 20,
+    ) -> None:
         super().__init__(initial_time=initial_time)
         self.__m = m
         self.__fast_forward = fast_forward
+
+        # Resolve uma única vez tudo que depende apenas da classe do modelo,
+        # evitando reflexão a cada evento da simulação
+        cls = type(m)
+        self.__resource_items = list(cls._get_resources().items())
+        entrypoints = getattr(cls, '__entrypoints', None)
+        if entrypoints is None:
+            # O decorador `entrypoint` altera este dicionário no lugar
+            entrypoints = {}
+            setattr(cls, '__entrypoints', entrypoints)
+        self.__entrypoints = entrypoints
+        match m.chave_modelo:
+            case 'bar-expresso':
+                self.__plot_title = 'Bar expresso'
+                self.__entrypoint_key = '_processa_cliente'
+            case 'lavanderia':
+                self.__plot_title = 'Lavanderia'
+                self.__entrypoint_key = '_processo_lavagem'
+
+        import matplotlib.pyplot as plt
+
         plt.ion()
+        self.__readers = None
+        self.__resource_index = {}
         self.__state = None
-        self.__maxs = {}
+
+        # Buffers pré-alocados, atualizados no lugar a cada evento
+        n = len(self.__resource_items)
+        self.__currents = np.zeros(n)
+        self.__totals = np.ones(n)
+        self.__usages = np.zeros(n)
+        self.__maxs = np.full(n, -np.inf)
+        self.__last_draw = 0.0
+        self.__min_interval = min_interval
+        self.__dirty = False
+        self.__dirty_indices = set()
 
     def close(self) -> None:
+        import matplotlib.pyplot as plt
+
         super().close()
 
-        if self.__fast_forward and (state := self.__state):
-            state.figure.canvas.draw()
-            state.figure.canvas.flush_events()
+        if state := self.__state:
+            # Garante que o último estado da simulação seja exibido, mesmo que
+            # a última atualização tenha sido descartada pelo intervalo mínimo
+            if self.__dirty:
+                self.__update(state)
+            if self.__fast_forward:
+                state.figure.canvas.draw()
+                state.figure.canvas.flush_events()
+            elif self.__dirty:
+                self.__blit(state)
+            self.__dirty = False
+            self.__dirty_indices.clear()
 
         plt.ioff()
         plt.show()
 
+    # Apenas este ambiente sobrescreve `step`, para que o `Environment` (sem gráficos)
+    # não pague a inspeção da fila e a chamada a `on_event` em cada evento da simulação
+    @typing.override
+    def step(self) -> None:
+        if self._queue:
+            time, priority, event_id, event = self._queue[0]
+            self.on_event(time, priority, event_id, event)
+        return super().step()
+
     @typing.override
     def on_event(
             self,
@@ -155,64 +290,123 @@ class InteractiveEnvironment[M](BaseEnvironment):
             event_id: int,
             event: simpy.Event,
     ) -> None:
-        values = []
-        for field_name, annotation in type(self.__m)._get_resources().items():
-            field_value = getattr(self.__m, field_name)
-
-            current: int
-            total: int
-
-            match field_value:
-                case simpy.Store():
-                    current = field_value.capacity - len(field_value.items)
-                    total = field_value.capacity
-                case simpy.Container():
-                    current = field_value.level
-                    total = field_value.capacity
-                case simpy.Resource():
-                    current = field_value.count
-                    total = field_value.capacity
-                case _:
-                    raise ValueError(f'{field_name}: unsupported resource type: {field_value}')
-
-            values.append((annotation.descricao, current, total))
+        currents = self.__currents
+        totals = self.__totals
+        usages = self.__usages
+        maxs = self.__maxs
+
+        readers = self.__readers
+        if readers is None:
+            # Os recursos só são criados em `executa`, então os leitores são montados no primeiro evento
+            readers = []
+            for i, (field_name, annotation) in enumerate(self.__resource_items):
+                resource = getattr(self.__m, field_name)
+                readers.append((annotation.descricao, _resource_reader(field_name, resource)))
+                self.__resource_index[resource] = i
+            self.__readers = readers
+
+            # Leitura completa de todos os recursos, apenas para o primeiro desenho
+            for i, (_, reader) in enumerate(readers):
+                currents[i], totals[i] = reader()
+            np.divide(currents, totals, out=usages)
+            usages *= 10
+            np.maximum(maxs, usages, out=maxs)
+
+        # Toda alteração de um recurso do SimPy gera um evento que o referencia (`Request`,
+        # `Release`, `Put`, `Get`), então apenas o recurso deste evento precisa ser lido
+        match event:
+            case simpy.resources.base.Put() | simpy.resources.base.Get():
+                i = self.__resource_index.get(event.resource)
+                if i is not None:
+                    currents[i], totals[i] = readers[i][1]()
+                    usage = usages[i] = 10 * currents[i] / totals[i]
+                    # O máximo é acompanhado a cada evento para não perder picos entre duas atualizações
+                    if usage > maxs[i]:
+                        maxs[i] = usage
+                    self.__dirty_indices.add(i)
 
         state: InteractiveState | None = self.__state
         if state is None:
-            plot_title: str
-            match self.__m.chave_modelo:
-                case 'bar-expresso':
-                    plot_title = 'Bar expresso'
-                case 'lavanderia':
-                    plot_title = 'Lavanderia'
-            state = load_figure(plot_title, values)
+            values = [(descricao, current, total) for (descricao, _), current, total in zip(readers, currents, totals)]
+            state = load_figure(self.__plot_title, values)
             self.__state = state
+            # Todos os gráficos recebem os valores lidos na próxima atualização
+            self.__dirty_indices.update(range(len(readers)))
+            # Recaptura os fundos sempre que a figura for redesenhada por completo (ex.: redimensionamento)
+            state.figure.canvas.mpl_connect('draw_event', lambda _: self.__on_draw(state))
             state.figure.canvas.draw()
             state.figure.canvas.flush_events()
+            self.__last_draw = timeit.default_timer()
         else:
-            entrypoints = getattr(type(self.__m), '__entrypoints', {})
-            entrypoint_key: str
-            match self.__m.chave_modelo:
-                case 'bar-expresso':
-                    entrypoint_key = '_processa_cliente'
-                case 'lavanderia':
-                    entrypoint_key = '_processo_lavagem'
-
-            state.subtitle_text.set_text(
-                f't={_fmt_tempo(event.env.now, self.__m.unidade_tempo)}, '
-                f'nº de clientes = {entrypoints[entrypoint_key]}'
-            )
-            for i, (title, current, total) in enumerate(values):
-                value = 10 * current / total
-                state.current_rects[i].set_width(value)
-                state.current_rects_labels[i].set_text(f'{current}')
-                max_value = max(self.__maxs.get(i, -math.inf), value)
-                self.__maxs[i] = max_value
-                state.max_rects[i].set_segments([np.array([[max_value, -0.2], [max_value, 0.2]])])
+            self.__dirty = True
+
+            now = timeit.default_timer()
+            if now - self.__last_draw < self.__min_interval:
+                return
 
+            self.__update(state)
             if not self.__fast_forward:
-                state.figure.canvas.draw()
-                state.figure.canvas.flush_events()
+                self.__blit(state)
+            self.__last_draw = now
+            self.__dirty = False
+            self.__dirty_indices.clear()
+
+    def __update(self, state: InteractiveState) -> None:
+        state.subtitle_text.set_text(
+            f't={_fmt_tempo(self.now, self.__m.unidade_tempo)}, '
+            f'nº de clientes = {self.__entrypoints.get(self.__entrypoint_key, 0)}'
+        )
+        for i in self.__dirty_indices:
+            state.current_rects[i].set_width(self.__usages[i])
+            state.current_rects_labels[i].set_text(f'{self.__currents[i]:g}')
+            state.max_segments[i][0, :, 0] = self.__maxs[i]
+            state.max_rects[i].stale = True
+
+    def __on_draw(self, state: InteractiveState) -> None:
+        import matplotlib.transforms
+
+        figure = state.figure
+        canvas = figure.canvas
+        state.backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in state.axes]
+        # Faixa acima do primeiro gráfico, onde fica o subtítulo
+        state.subtitle_bbox = matplotlib.transforms.Bbox.from_extents(
+            figure.bbox.x0, state.axes[0].bbox.y1, figure.bbox.x1, figure.bbox.y1,
+        )
+        state.subtitle_background = canvas.copy_from_bbox(state.subtitle_bbox)
+
+        figure.draw_artist(state.subtitle_text)
+        for i, ax in enumerate(state.axes):
+            ax.draw_artist(state.current_rects[i])
+            ax.draw_artist(state.current_rects_labels[i])
+            ax.draw_artist(state.max_rects[i])
+
+    def __blit(self, state: InteractiveState) -> None:
+        canvas = state.figure.canvas
+
+        canvas.restore_region(state.subtitle_background)
+        state.figure.draw_artist(state.subtitle_text)
+        canvas.blit(state.subtitle_bbox)
+
+        # Apenas os gráficos cujos recursos mudaram desde a última atualização são redesenhados
+        for i in self.__dirty_indices:
+            ax = state.axes[i]
+            canvas.restore_region(state.backgrounds[i])
+            ax.draw_artist(state.current_rects[i])
+            ax.draw_artist(state.current_rects_labels[i])
+            ax.draw_artist(state.max_rects[i])
+            canvas.blit(ax.bbox)
+
+        canvas.flush_events()
+
+
+def carrega_configuracao() -> dict[str, typing.Any]:
+    import tomllib
+
+    try:
+        with open(os.path.join(os.getcwd(), 'config.toml'), 'rb') as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return {}
 
 
 def executa_script(
@@ -220,11 +414,7 @@ def executa_script(
         x_range: tuple[int, int, int] = (30, 360, 30),
         y_range: tuple[int, int, int] = (0, 120, 15),
 ) -> None:
-    try:
-        with open(os.path.join(os.getcwd(), 'config.toml'), 'rb') as f:
-            dados = tomllib.load(f)
-    except FileNotFoundError:
-        dados = {}
+    dados = carrega_configuracao()
 
     dados_geral = dados.get('geral', {})
     seed = dados_geral.get('seed')
@@ -244,7 +434,12 @@ def executa_script(
         env: BaseEnvironment
         if deve_exibir_grafico_interativo:
             deve_pular_interacao = dados_grafico_interativo.get('pular', False)
-            env = InteractiveEnvironment(modelo, fast_forward=deve_pular_interacao)
+            intervalo_minimo = dados_grafico_interativo.get('intervalo', 1 / 20)
+            env = InteractiveEnvironment(
+                modelo,
+                fast_forward=deve_pular_interacao,
+                min_interval=intervalo_minimo,
+            )
         else:
             env = Environment()
 
@@ -254,19 +449,26 @@ def executa_script(
         env.close()
         return
 
+    # Apenas o gráfico precisa da lista de métricas e da unidade de tempo do modelo
+    deve_executar_independente = dados_grafico.get('execucoes-independentes', False)
     _plot(
-        lambda: M.from_json(seed, False, dados_modelos),
+        # `functools.partial` (ao contrário de uma lambda) pode ser enviada para outros processos
+        functools.partial(M.from_json, deve_exibir_log=False, data=dados_modelos),
         metricas=M.lista_metricas(),
         descritor_metrica=M.descreve_metrica,
         x_range=x_range,
         y_range=y_range,
         time_unit=M.time_unit(),
+        independent_runs=deve_executar_independente,
+        seed=seed,
     )
 
 
 @dataclasses.dataclass(kw_only=True, frozen=True)
 class ParametroModelo:
     chave: str
+    # Valor usado quando a chave não está no arquivo de configuração; sem ele, a chave é obrigatória
+    padrao: typing.Any | None = None
 
 
 @dataclasses.dataclass(kw_only=True, frozen=True)
@@ -279,7 +481,111 @@ class RecursoModelo:
     descricao: str
 
 
-class ModeloMetaclass(type):
+class Amostras:
+    # Valores de uma métrica, guardados em um array do NumPy pré-alocado (que dobra de tamanho
+    # quando cheio) em vez de uma lista de `float`s do Python, para que os resumos ao final da
+    # simulação operem diretamente sobre memória contígua. A média também é mantida de forma
+    # incremental (algoritmo de Welford), para que possa ser consultada a qualquer momento da
+    # simulação sem percorrer todos os valores já registrados
+    __slots__ = ('_valores', '_qtd', '_media', '_m2')
+
+    def __init__(self, valores: typing.Iterable[float] = (), capacidade: int = 1024) -> None:
+        self._valores = np.empty(capacidade, dtype=np.float64)
+        self._qtd = 0
+        self._media = 0.0
+        self._m2 = 0.0
+        for valor in valores:
+            self.append(valor)
+
+    def append(self, valor: float) -> None:
+        qtd = self._qtd
+        if qtd == len(self._valores):
+            self._valores = np.concatenate((self._valores, np.empty_like(self._valores)))
+        self._valores[qtd] = valor
+        self._qtd = qtd = qtd + 1
+
+        delta = valor - self._media
+        self._media += delta / qtd
+        self._m2 += delta * (valor - self._media)
+
+    def __len__(self) -> int:
+        return self._qtd
+
+    def __iter__(self) -> typing.Iterator[float]:
+        return iter(self._valores[:self._qtd].tolist())
+
+    def __array__(self, dtype: typing.Any = None, copy: bool | None = None) -> np.ndarray:
+        valores = self._valores[:self._qtd]
+        if dtype is not None and dtype != valores.dtype:
+            return valores.astype(dtype)
+        return valores.copy() if copy else valores
+
+    def __repr__(self) -> str:
+        return f'Amostras({self._valores[:self._qtd].tolist()})'
+
+    @property
+    def media(self) -> float:
+        if not self._qtd:
+            raise statistics.StatisticsError('mean requires at least one data point')
+        return self._media
+
+    @property
+    def desvio_padrao(self) -> float:
+        # Desvio-padrão amostral, assim como `statistics.stdev`
+        if self._qtd < 2:
+            raise statistics.StatisticsError('stdev requires at least two data points')
+        return math.sqrt(self._m2 / (self._qtd - 1))
+
+
+# Logger vazio, usado no lugar de `_log` quando os logs estão desativados. Os processos podem comparar o seu
+# logger com esta função para evitar montar as mensagens que não serão exibidas
+def sem_log(*args: typing.Any) -> None:
+    pass
+
+
+def configura_log(modelo: typing.Any, deve_exibir_log: bool) -> None:
+    # Sem log, o `_log` do modelo passa a ser a função vazia, o que evita verificar `deve_exibir_log` a cada chamada
+    if not deve_exibir_log:
+        modelo._log = sem_log
+
+
+class Amostrador:
+    # Sorteia os valores de uma distribuição em lotes, evitando o custo de uma chamada ao
+    # gerador do NumPy (Python → C) para cada valor sorteado durante a simulação
+    __slots__ = ('_sorteia', '_tamanho_lote', '_amostras')
+
+    def __init__(self, sorteia: typing.Callable[[int], np.ndarray], tamanho_lote: int = 4096) -> None:
+        self._sorteia = sorteia
+        self._tamanho_lote = tamanho_lote
+        self._amostras: typing.Iterator[typing.Any] = iter(())
+
+    def proximo(self) -> typing.Any:
+        try:
+            return next(self._amostras)
+        except StopIteration:
+            # `tolist` converte o lote para tipos nativos do Python, mais rápidos de operar individualmente
+            self._amostras = iter(self._sorteia(self._tamanho_lote).tolist())
+            return next(self._amostras)
+
+
+# Valor inicial de cada tipo de métrica. Chamar o próprio tipo sem argumentos produz seu valor padrão
+# (ex.: `int()` é 0, `list()` é uma nova lista vazia), evitando compartilhar objetos mutáveis entre execuções
+_METRICS_FACTORIES: dict[typing.Any, typing.Callable[[], object]] = {
+    # Métricas de tempo, cuja média é consultada pelo gráfico ao longo da simulação
+    list[float]: Amostras,
+    int: int,
+    float: float,
+    bool: bool,
+    list: list,
+    dict: dict,
+    tuple: tuple,
+    set: set,
+    str: str,
+}
+
+
+# Derivada de `abc.ABCMeta` para que um modelo com variantes possa declarar métodos abstratos
+class ModeloMetaclass(abc.ABCMeta):
     def _log_stats(
             cls,
             prefix: str,
@@ -293,41 +599,78 @@ class ModeloMetaclass(type):
                 f'expected ({', '.join(expected_time_unit_values)}), got {time_unit}'
             )
 
-        mean = statistics.mean(values)
-        stdev = statistics.stdev(values)
+        if len(values) < 2:
+            # Mantém o comportamento do `statistics` (`StatisticsError`) para amostras insuficientes
+            mean = statistics.mean(values)
+            stdev = statistics.stdev(values)
+            min_value = min(values)
+            max_value = max(values)
+        elif isinstance(values, Amostras):
+            # Média e desvio-padrão já foram acumulados durante a simulação, restando apenas os extremos
+            arr = np.asarray(values)
+            mean = values.media
+            stdev = values.desvio_padrao
+            min_value = arr.min()
+            max_value = arr.max()
+        else:
+            arr = np.asarray(values, dtype=np.float64)
+            mean = arr.mean()
+            stdev = arr.std(ddof=1)
+            min_value = arr.min()
+            max_value = arr.max()
+
         print(
             f'{prefix}: '
             f'{_fmt_tempo(mean, time_unit=time_unit)} (± {stdev:.2f}), '
-            f'min={_fmt_tempo(min(values), time_unit=time_unit)}, '
-            f'max={_fmt_tempo(max(values), time_unit=time_unit)}'
+            f'min={_fmt_tempo(min_value, time_unit=time_unit)}, '
+            f'max={_fmt_tempo(max_value, time_unit=time_unit)}'
         )
 
+    # Os resultados de `_get_*` são guardados no `__dict__` da própria classe (e não herdados),
+    # já que os campos declarados são sobrescritos pelos seus valores concretos após a inicialização
+    def _get_annotations(cls) -> dict[str, typing.Any]:
+        # `cls.__annotations__` contém apenas os campos declarados na própria classe, então os campos
+        # declarados nas classes base (ex.: por um modelo com variantes) são reunidos a partir do MRO
+        annotations = cls.__dict__.get('_cached_annotations')
+        if annotations is None:
+            annotations = {}
+            for base in reversed(cls.__mro__):
+                annotations.update(base.__dict__.get('__annotations__', {}))
+            cls._cached_annotations = annotations
+        return annotations
+
     def _get_metrics(cls) -> dict[str, MetricaModelo]:
-        try:
-            return cls.__base_metrics
-        except AttributeError:
-            return {
+        metrics = cls.__dict__.get('_cached_metrics')
+        if metrics is None:
+            metrics = {
                 field_name: field_value
-                for field_name, _ in cls.__annotations__.items()
+                for field_name in cls._get_annotations()
                 if isinstance(field_value := getattr(cls, field_name, None), MetricaModelo)
             }
+            cls._cached_metrics = metrics
+        return metrics
 
     def _get_parameters(cls) -> dict[str, ParametroModelo]:
-        return {
-            field_name: field_value
-            for field_name in dir(cls)
-            if isinstance(field_value := getattr(cls, field_name), ParametroModelo)
-        }
+        parameters = cls.__dict__.get('_cached_parameters')
+        if parameters is None:
+            parameters = {
+                field_name: field_value
+                for field_name in dir(cls)
+                if isinstance(field_value := getattr(cls, field_name), ParametroModelo)
+            }
+            cls._cached_parameters = parameters
+        return parameters
 
     def _get_resources(cls) -> dict[str, RecursoModelo]:
-        try:
-            return cls.__base_resources
-        except AttributeError:
-            return {
+        resources = cls.__dict__.get('_cached_resources')
+        if resources is None:
+            resources = {
                 field_name: field_value
-                for field_name, _ in cls.__annotations__.items()
+                for field_name in cls._get_annotations()
                 if isinstance(field_value := getattr(cls, field_name, None), RecursoModelo)
             }
+            cls._cached_resources = resources
+        return resources
 
     def _initialize_parameters_fields(cls, kwargs: dict[str, typing.Any]) -> None:
         expected_arguments = {field_name for field_name, _ in cls._get_parameters().items()}
@@ -338,65 +681,50 @@ class ModeloMetaclass(type):
         for field_name in expected_arguments:
             setattr(cls, field_name, kwargs.pop(field_name))
 
-    def _initialize_metrics_fields(cls) -> None:
-        base_metrics: dict[str, MetricaModelo] = {}
-        for field_name, annotation in cls._get_metrics().items():
-            field_type = cls.__annotations__[field_name]
-            while field_parent_type := typing.get_origin(field_type):
-                field_type = field_parent_type
-
-            default_value: object
-            match field_type:
-                case builtins.int:
-                    default_value = 0
-                case builtins.float:
-                    default_value = 0.0
-                case builtins.bool:
-                    default_value = False
-                case builtins.list:
-                    default_value = []
-                case builtins.dict:
-                    default_value = {}
-                case builtins.tuple:
-                    default_value = ()
-                case builtins.set:
-                    default_value = set()
-                case builtins.str:
-                    default_value = ''
-                case _:
+    def _get_metrics_factories(cls) -> dict[str, typing.Callable[[], object]]:
+        factories = cls.__dict__.get('_cached_metrics_factories')
+        if factories is None:
+            factories = {}
+            for field_name in cls._get_metrics():
+                field_type = cls._get_annotations()[field_name]
+                while field_type not in _METRICS_FACTORIES and (field_parent_type := typing.get_origin(field_type)):
+                    field_type = field_parent_type
+
+                factory = _METRICS_FACTORIES.get(field_type)
+                if factory is None:
                     raise ValueError(f'unsupported type: {field_type}')
 
-            setattr(cls, field_name, default_value)
-            base_metrics[field_name] = annotation
-        cls.__base_metrics = base_metrics
+                factories[field_name] = factory
+            cls._cached_metrics_factories = factories
+        return factories
+
+    def _initialize_metrics_fields(cls, instance: typing.Any) -> None:
+        # Valores novos em cada instância (e não na classe), para que execuções distintas não
+        # compartilhem as mesmas listas de métricas
+        for field_name, factory in cls._get_metrics_factories().items():
+            setattr(instance, field_name, factory())
 
     def _initialize_resources_fields(cls) -> None:
-        base_resources: dict[str, RecursoModelo] = {}
-        for field_name, annotation in cls._get_resources().items():
-            field_type = cls.__annotations__[field_name]
-            while field_parent_type := typing.get_origin(field_type):
-                field_type = field_parent_type
+        for field_name in cls._get_resources():
             setattr(cls, field_name, None)
-            base_resources[field_name] = annotation
-        cls.__base_resources = base_resources
 
-    def from_json(cls, seed: int | None, deve_exibir_log: bool, data: dict[str, typing.Any]):
+    def from_json(cls, seed: int | numpy.random.SeedSequence | None, deve_exibir_log: bool, data: dict[str, typing.Any]):
         model_key = getattr(cls, 'chave_modelo', None)
         if not model_key:
             raise ValueError('model must have a annotation named \'chave_modelo\'')
         model_data = data.get(model_key, {})
 
-        expected_map: dict[str, str] = {
-            parameter.chave: field_name
-            for field_name, parameter in cls._get_parameters().items()
+        parameters = cls._get_parameters()
+        missing_keys = {
+            parameter.chave
+            for parameter in parameters.values()
+            if parameter.padrao is None and parameter.chave not in model_data
         }
-        actual_keys = set(model_data.keys()) & set(expected_map.keys())
-        missing_keys = set(expected_map.keys()) - actual_keys
         if missing_keys:
             raise ValueError(f'missing keys for {cls.__name__}: {', '.join(missing_keys)}')
         parameters_kwargs = {
-            field_name: model_data[field_key]
-            for field_key, field_name in expected_map.items()
+            field_name: model_data.get(parameter.chave, parameter.padrao)
+            for field_name, parameter in parameters.items()
         }
         return cls(
             seed=seed,
@@ -416,88 +744,184 @@ class ModeloMetaclass(type):
     def descreve_metrica(cls, metrica: MetricaModelo) -> str:
         return metrica.descricao
 
+    def _get_time_metrics(cls) -> dict[str, MetricaModelo]:
+        time_metrics = cls.__dict__.get('_cached_time_metrics')
+        if time_metrics is None:
+            time_metrics = {
+                field_name: annotation
+                for field_name, annotation in cls._get_metrics().items()
+                if cls._get_annotations()[field_name] == list[float]
+            }
+            cls._cached_time_metrics = time_metrics
+        return time_metrics
+
     def lista_metricas(cls) -> list[MetricaModelo]:
-        return [
-            annotation
-            for field_name, annotation in cls._get_metrics().items()
-            if cls.__annotations__[field_name] == list[float]
-        ]
+        return list(cls._get_time_metrics().values())
+
+    def __init__(cls, name: str, bases: tuple[type, ...], namespace: dict[str, typing.Any], **kwargs) -> None:
+        super().__init__(name, bases, namespace, **kwargs)
+
+        # Os métodos abaixo dependem apenas da classe, então são instalados uma única vez na sua
+        # criação (e não a cada instância criada, o que encadeava um novo `executa` a cada chamada)
+        if getattr(cls, 'executa', None) is None:
+            raise ValueError(
+                'model must have a method named \'executa\': `def executa(self, env: simpy.Environment) -> None`'
+            )
+
+        # Varre os campos declarados já na criação da classe, enquanto ainda contêm os descritores
+        # (`ParametroModelo`, `MetricaModelo`, `RecursoModelo`) e não os valores de uma execução
+        cls._get_parameters()
+        cls._get_metrics()
+        cls._get_resources()
+        cls._get_time_metrics()
+        # Resolve também os tipos das métricas, antes das execuções de `executa`
+        cls._get_metrics_factories()
+
+        # Os métodos abaixo só são instalados quando o modelo não declara a sua própria versão, com a
+        # mesma assinatura (ex.: um `_log` que formata o horário da simulação)
+
+        # Sempre exibe o log: instâncias criadas sem log recebem `sem_log` em `__call__`,
+        # o que evita verificar essa condição a cada chamada
+        if '_log' not in namespace:
+            def _log(self, env: simpy.Environment, *args: str) -> None:
+                print(f'{env.now:05.2f}', *args, sep=': ')
+
+            cls._log = _log
+
+        if '_cria_log' not in namespace:
+            def _cria_log(self, env: simpy.Environment, *prefixo: str) -> typing.Callable[..., None]:
+                # Sem log, todos os processos compartilham a mesma função vazia em vez de
+                # criarem um `functools.partial` a cada execução
+                log = self._log
+                if log is sem_log:
+                    return sem_log
+                return functools.partial(log, env, *prefixo)
+
+            cls._cria_log = _cria_log
+
+        if 'exibe_estado' not in namespace:
+            def exibe_estado(self):
+                for field_name, annotation in cls._get_time_metrics().items():
+                    cls._log_stats(annotation.descricao, getattr(self, field_name))
+
+            cls.exibe_estado = exibe_estado
+
+        # `MetricaModelo` é comparada (e indexada) por valor, já que pode ter sido copiada para outro processo
+        metrics_fields = {annotation: field_name for field_name, annotation in cls._get_metrics().items()}
+
+        def calcula_metrica(self, metrica: MetricaModelo) -> str:
+            return getattr(self, metrics_fields[metrica])
+
+        cls.calcula_metrica = calcula_metrica
+
+        def calcula_media_metrica(self, metrica: MetricaModelo) -> float:
+            # Média mantida incrementalmente por `Amostras`, sem percorrer os valores registrados.
+            # No início da simulação, uma métrica pode ainda não ter nenhum valor registrado: a média é
+            # indefinida (NaN), e o matplotlib deixa esse ponto em branco em vez de desenhá-lo em zero
+            valores: Amostras = getattr(self, metrics_fields[metrica])
+            return valores.media if valores else math.nan
+
+        cls.calcula_media_metrica = calcula_media_metrica
 
     def __call__(
             cls,
             *,
             deve_exibir_log: bool = True,
-            seed: int = None,
+            seed: int | numpy.random.SeedSequence | None = None,
             **kwargs,
     ):
-        cls._deve_exibir_log = deve_exibir_log
-        cls._rnd = numpy.random.default_rng(seed)
         cls._initialize_parameters_fields(kwargs)
         cls._initialize_resources_fields()
 
-        def _log(self, env: simpy.Environment, *args: str) -> None:
-            if self._deve_exibir_log:
-                print(f'{env.now:05.2f}', *args, sep=': ')
-
-        cls._log = _log
+        instance = super().__call__(**kwargs)
+        cls._initialize_metrics_fields(instance)
+        configura_log(instance, deve_exibir_log)
+        # Estado próprio de cada instância, para que modelos distintos não compartilhem o mesmo gerador
+        # SFC64 em vez do PCG64 padrão de `default_rng`: é o gerador de bits mais rápido do NumPy,
+        # e a simulação não depende das garantias estatísticas adicionais do PCG64
+        instance._rnd = numpy.random.Generator(numpy.random.SFC64(seed))
+        return instance
 
-        def exibe_estado(self):
-            for field_name, annotation in cls._get_metrics().items():
-                field_type = cls.__annotations__[field_name]
-                if field_type == list[float]:
-                    prefix = annotation.descricao
-                    cls._log_stats(prefix, getattr(self, field_name))
 
-        cls.exibe_estado = exibe_estado
+def _fmt_eixo(days: float, hours: float, minutes: float) -> str:
+    tokens: list[str] = []
+    if days > 0:
+        tokens.append(f'{days}d')
+    if hours > 0:
+        tokens.append(f'{hours}h')
+    if minutes > 0:
+        tokens.append(f'{minutes}m')
+    return ''.join(tokens)
 
-        def calcula_metrica(self, metrica: MetricaModelo) -> str:
-            field_name = next(
-                field_name
-                for field_name, annotation in cls.__base_metrics.items()
-                if annotation is metrica
-            )
-            return getattr(self, field_name)
 
-        cls.calcula_metrica = calcula_metrica
+# Um formatador por unidade de tempo, escolhido uma única vez por gráfico
+@functools.lru_cache(maxsize=512)
+def _fmt_eixo_horas(value: float) -> str:
+    days, hours = divmod(value, 24)
+    return _fmt_eixo(days, hours, 0)
 
-        executa_1 = getattr(cls, 'executa', None)
-        if executa_1 is None:
-            raise ValueError(
-                'model must have a method named \'executa\': `def executa(self, env: simpy.Environment) -> None`'
-            )
 
-        def executa_2(self, env: simpy.Environment) -> None:
-            cls._initialize_metrics_fields()
-            return executa_1(self, env)
+@functools.lru_cache(maxsize=512)
+def _fmt_eixo_minutos(value: float) -> str:
+    days, hm = divmod(value, 1440)
+    hours, minutes = divmod(hm, 60)
+    return _fmt_eixo(days, hours, minutes)
 
-        cls.executa = executa_2
 
-        return super().__call__(**kwargs)
+def _executa_ate[M](
+        criador_modelo: typing.Callable[[numpy.random.SeedSequence], M],
+        metricas: typing.Sequence[MetricaModelo],
+        until: int,
+        seed: numpy.random.SeedSequence,
+) -> list[float]:
+    env = simpy.Environment()
+    modelo = criador_modelo(seed)
+    modelo.executa(env)
+    env.run(until=until)
+    return [modelo.calcula_media_metrica(metrica) for metrica in metricas]
 
 
 def _plot[M](
-        criador_modelo: typing.Callable[[], M],
+        criador_modelo: typing.Callable[[int | numpy.random.SeedSequence | None], M],
         metricas: typing.Sequence[MetricaModelo],
         descritor_metrica: typing.Callable[[MetricaModelo], str],
         x_range: tuple[int, int, int],
         y_range: tuple[int, int, int],
         time_unit: typing.Literal['hours', 'minutes'] = 'minutes',
+        independent_runs: bool = False,
+        seed: int | None = None,
 ) -> None:
     min_x, max_x, step_x = x_range
     min_y, max_y, step_y = y_range
 
-    x = []
-    medidas: dict[M, list[float]] = {}
-    for until in range(min_x, max_x + 1, step_x):
+    x = list(range(min_x, max_x + 1, step_x))
+    medidas: dict[MetricaModelo, list[float]] = {metrica: [0.0] * len(x) for metrica in metricas}
+    if independent_runs:
+        # Cada ponto do gráfico é uma simulação nova e independente, executada do zero
+        # até `until`, então as simulações são distribuídas entre os núcleos disponíveis. Cada uma
+        # recebe sua própria semente, derivada de `seed`, para que as execuções sejam de fato
+        # independentes entre si e ainda reprodutíveis
+        seeds = numpy.random.SeedSequence(seed).spawn(len(x))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            resultados = executor.map(functools.partial(_executa_ate, criador_modelo, metricas), x, seeds)
+            for i, medias in enumerate(resultados):
+                for metrica, media in zip(metricas, medias):
+                    medidas[metrica][i] = media
+    else:
+        # Uma única simulação é avançada até cada ponto do gráfico, registrando as métricas
+        # parciais, em vez de simular novamente todo o intervalo [0, until] para cada ponto
         env = simpy.Environment()
-        modelo = criador_modelo()
+        modelo = criador_modelo(seed)
         modelo.executa(env)
-        env.run(until=until)
+        for i, until in enumerate(x):
+            env.run(until=until)
+
+            # As métricas mantêm a própria média, então ela não é recalculada sobre todo o histórico
+            for metrica in metricas:
+                medidas[metrica][i] = modelo.calcula_media_metrica(metrica)
 
-        x.append(until)
-        for metrica in metricas:
-            valores = modelo.calcula_metrica(metrica)
-            medidas.setdefault(metrica, []).append(statistics.mean(valores))
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker
 
     fig, ax = plt.subplots()
     for metrica in metricas:
@@ -507,35 +931,23 @@ def _plot[M](
     ax.set_xlabel('Tempo da simulação')
     ax.set_ylabel('Tempo médio da ação')
 
-    def major_formatter(value: float, _: float) -> str:
-        days: float
-        hours: float
-        minutes: float
-        match time_unit:
-            case 'hours':
-                days, hours = divmod(value, 24)
-                minutes = 0
-            case 'minutes':
-                days, hm = divmod(value, 1440)
-                hours, minutes = divmod(hm, 60)
-            case _:
-                typing.assert_never(time_unit)
-
-        tokens: list[str] = []
-        if days > 0:
-            tokens.append(f'{days}d')
-        if hours > 0:
-            tokens.append(f'{hours}h')
-        if minutes > 0:
-            tokens.append(f'{minutes}m')
-        return ''.join(tokens)
-
+    # O matplotlib formata os mesmos valores repetidas vezes durante o layout, então
+    # o formatador apenas consulta a versão em cache
+    fmt_eixo: typing.Callable[[float], str]
+    match time_unit:
+        case 'hours':
+            fmt_eixo = _fmt_eixo_horas
+        case 'minutes':
+            fmt_eixo = _fmt_eixo_minutos
+        case _:
+            typing.assert_never(time_unit)
+    major_formatter = matplotlib.ticker.FuncFormatter(lambda value, _: fmt_eixo(value))
     ax.xaxis.set_major_formatter(major_formatter)
     ax.yaxis.set_major_formatter(major_formatter)
     ax.set_xlim(min_x, max_x)
     ax.set_ylim(min_y, max_y)
-    ax.set_xticks(list(range(min_x, max_x + 1, step_x)))
-    ax.set_yticks(list(range(min_y, max_y + 1, step_y)))
+    ax.set_xticks(x)
+    ax.set_yticks(range(min_y, max_y + 1, step_y))
     ax.grid(axis='y')
     ax.legend()
     plt.show()
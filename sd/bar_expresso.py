@@ -1,36 +1,31 @@
 import dataclasses
-import functools
 import itertools
 
+import numpy as np
 import simpy.resources.resource
 
 import sd
 
+# A probabilidade de um cliente tomar 1 copo é de 0,3; 2 copos 0,45; 3 copos 0,2; e 4 copos 0,05.
+# A distribuição acumulada é calculada uma única vez, em vez de a cada sorteio por `Generator.choice`
+_QTD_PEDIDOS = np.array([1, 2, 3, 4])
+_QTD_PEDIDOS_ACUMULADO = np.array([0.3, 0.75, 0.95, 1.0])
 
-@dataclasses.dataclass
+
+# Mutável, já que o copo é marcado como limpo/sujo ao longo da simulação
+@dataclasses.dataclass(slots=True)
 class Copo:
     id: int
     limpo: bool
 
 
-@dataclasses.dataclass
-class Coleta:
-    id_pedido: int
-    id_cliente: int
-
-
-@dataclasses.dataclass
-class Preparo:
-    copo: Copo | None
-
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Retirada:
     copo: Copo
     id_cliente: int
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True, frozen=True)
 class Funcionario:
     id: int
 
@@ -53,16 +48,43 @@ class ModeloBarExpresso(metaclass=sd.ModeloMetaclass):
     _tempos_preparo: list[float] = sd.MetricaModelo(descricao='Tempo preparo')
 
     # Implementação do modelo
-    _store_funcionarios: simpy.Store = sd.RecursoModelo(descricao='Funcionários')
+    _resource_funcionarios: simpy.Resource = sd.RecursoModelo(descricao='Funcionários')
     _store_copos: simpy.Store = sd.RecursoModelo(descricao='Copos')
     _resource_cadeiras: simpy.Resource = sd.RecursoModelo(descricao='Cadeiras')
     _resource_lavagem: simpy.Resource = sd.RecursoModelo(descricao='Copos (pia)')
 
+    # Identificação dos funcionários livres, usada apenas nos logs
+    _funcionarios_livres: list[Funcionario]
+
+    _amostrador_chegada: sd.Amostrador
+    _amostrador_qtd_pedidos: sd.Amostrador
+    _amostrador_atendimento: sd.Amostrador
+    _amostrador_consumo: sd.Amostrador
+    _amostrador_freezer: sd.Amostrador
+
     def executa(self, env: simpy.Environment) -> None:
-        # O bar possui 2 funcionários
-        self._store_funcionarios = simpy.Store(env, capacity=self._qtd_funcionarios)
-        for idx_funcionario in range(self._qtd_funcionarios):
-            self._store_funcionarios.put(Funcionario(id=idx_funcionario + 1))
+        # Distribuições sorteadas em lotes
+        rnd = self._rnd
+        # Os clientes chegam em média a cada 4 min de acordo com uma função exponencial
+        self._amostrador_chegada = sd.Amostrador(lambda n: rnd.exponential(4, size=n))
+        # A quantidade de pedidos é sorteada pela inversa da distribuição acumulada
+        self._amostrador_qtd_pedidos = sd.Amostrador(
+            lambda n: _QTD_PEDIDOS[np.searchsorted(_QTD_PEDIDOS_ACUMULADO, rnd.random(n), side='right')],
+        )
+        # Funcionários atendem o pedido (e recolhem o copo) em 0,7min com desvio de 0,3min
+        self._amostrador_atendimento = sd.Amostrador(lambda n: np.abs(rnd.normal(0.7, scale=0.3, size=n)))
+        # Os clientes levam em média 3 min para consumir uma bebida de acordo
+        # com uma função normal com desvio padrão de 1min
+        self._amostrador_consumo = sd.Amostrador(lambda n: np.abs(rnd.normal(3, scale=1, size=n)))
+        # Funcionários lavam o copo e colocam no freezer em 0,5min com desvio de 0,1min
+        self._amostrador_freezer = sd.Amostrador(lambda n: np.abs(rnd.normal(0.5, scale=0.1, size=n)))
+
+        # O bar possui 2 funcionários, intercambiáveis entre si
+        self._resource_funcionarios = simpy.Resource(env, capacity=self._qtd_funcionarios)
+        self._funcionarios_livres = [
+            Funcionario(id=idx_funcionario + 1)
+            for idx_funcionario in reversed(range(self._qtd_funcionarios))
+        ]
 
         # O bar possui 20 copos
         self._store_copos = simpy.Store(env, capacity=self._qtd_copos)
@@ -77,16 +99,22 @@ class ModeloBarExpresso(metaclass=sd.ModeloMetaclass):
         env.process(self._processa_clientes(env))
 
     def _processa_clientes(self, env: simpy.Environment) -> sd.Generator:
+        # Métodos usados a cada cliente, resolvidos uma única vez
+        process = env.process
+        timeout = env.timeout
+        proxima_chegada = self._amostrador_chegada.proximo
+        processa_cliente = self._processa_cliente
+
         for id_cliente in itertools.count(start=1):
-            env.process(self._processa_cliente(env, id_cliente))
+            process(processa_cliente(env, id_cliente))
 
             # Os clientes chegam em média a cada 4 min
             # de acordo com uma função exponencial
-            yield env.timeout(self._rnd.exponential(4))
+            yield timeout(proxima_chegada())
 
     @sd.entrypoint
     def _processa_cliente(self, env: simpy.Environment, id_cliente: int) -> sd.Generator:
-        log = functools.partial(self._log, env, f'cliente {id_cliente}')
+        log = self._cria_log(env, f'cliente {id_cliente}')
         log('chega')
         tempo_inicio_estadia = env.now
 
@@ -102,37 +130,42 @@ class ModeloBarExpresso(metaclass=sd.ModeloMetaclass):
             self._tempos_espera_sentar_cliente.append(env.now - tempo_inicio_espera_sentar)
 
             # A probabilidade de um cliente tomar 1 copo é de 0,3; 2 copos 0,45; 3 copos 0,2; e 4 copos 0,05.
-            qtd_pedidos = self._rnd.choice([1, 2, 3, 4], p=[0.3, 0.45, 0.2, 0.05])
+            qtd_pedidos = self._amostrador_qtd_pedidos.proximo()
             log(f'ocupa cadeira e pretende consumir {qtd_pedidos} pedidos')
 
+            # Métodos usados a cada pedido, resolvidos uma única vez
+            timeout = env.timeout
+            proximo_consumo = self._amostrador_consumo.proximo
+            registra_espera_pedir = self._tempos_espera_pedir_cliente.append
+            registra_espera_consumir = self._tempos_espera_consumir_cliente.append
+
             for idx_pedido in range(qtd_pedidos):
+                pedido = f'pedido {idx_pedido + 1}/{qtd_pedidos}'
                 # (Fila) Aguarda funcionário ficar disponível para coletar o pedido
-                log(f'pedido {idx_pedido + 1}/{qtd_pedidos}', 'aguarda funcionário ficar disponível')
+                log(pedido, 'aguarda funcionário ficar disponível')
                 tempo_inicio_espera_pedir = env.now
 
-                # Aguarda até que o evento seja concluído pelo funcionário
-                yield env.process(self._processa_funcionario__coleta(env, Coleta(
-                    id_pedido=idx_pedido + 1,
-                    id_cliente=id_cliente,
-                )))
-                self._tempos_espera_pedir_cliente.append(env.now - tempo_inicio_espera_pedir)
+                # Aguarda até que o pedido seja coletado pelo funcionário. Como o cliente apenas espera
+                # por essa etapa, ela é executada no próprio processo do cliente (via `yield from`), em
+                # vez de em um novo processo do SimPy
+                yield from self._processa_funcionario__coleta(env, idx_pedido + 1, id_cliente)
+                registra_espera_pedir(env.now - tempo_inicio_espera_pedir)
 
                 tempo_inicio_espera_consumir = env.now
                 # (Fila) Aguarda pedido ficar pronto
-                log(f'pedido {idx_pedido + 1}/{qtd_pedidos}', 'aguarda pedido ser preparado')
+                log(pedido, 'aguarda pedido ser preparado')
 
-                # Aguarda até que o evento seja concluído pelo funcionário
-                copo_pedido: Copo = yield env.process(self._processa_funcionario__preparo(env, copo_cliente))
-                tempo_espera_consumir = env.now - tempo_inicio_espera_consumir
-                self._tempos_espera_consumir_cliente.append(tempo_espera_consumir)
+                # Aguarda até que o pedido seja preparado pelo funcionário
+                copo_pedido: Copo = yield from self._processa_funcionario__preparo(env, copo_cliente)
+                registra_espera_consumir(env.now - tempo_inicio_espera_consumir)
                 if copo_cliente is None:
                     copo_cliente = copo_pedido
 
                 # [Atividade] Consume pedido
                 # Os clientes levam em média 3 min para consumir uma bebida de acordo
                 # com uma função normal com desvio padrão de 1min
-                log(f'pedido {idx_pedido + 1}/{qtd_pedidos}', 'consome pedido')
-                yield env.timeout(abs(self._rnd.normal(3, scale=1)))
+                log(pedido, 'consome pedido')
+                yield timeout(proximo_consumo())
 
                 self._no_pedidos_consumidos += 1
 
@@ -145,61 +178,65 @@ class ModeloBarExpresso(metaclass=sd.ModeloMetaclass):
 
         self._tempos_estadia_cliente.append(env.now - tempo_inicio_estadia)
 
-    def _processa_funcionario__coleta(self, env: simpy.Environment, coleta: Coleta) -> sd.Generator:
-        # (Fila) Aguarda funcionário
-        funcionario: Funcionario = yield self._store_funcionarios.get()
-        log = functools.partial(self._log, env, f'funcionário {funcionario.id}')
+    def _processa_funcionario__coleta(self, env: simpy.Environment, id_pedido: int, id_cliente: int) -> sd.Generator:
+        with self._resource_funcionarios.request() as request_funcionario:
+            # (Fila) Aguarda funcionário
+            yield request_funcionario
+            funcionario = self._funcionarios_livres.pop()
+            log = self._cria_log(env, f'funcionário {funcionario.id}')
 
-        # [Atividade] Coleta do pedido
-        # Funcionários atendem o pedido em 0,7min com desvio de 0,3min
-        log(f'coleta pedido {coleta.id_pedido} do cliente {coleta.id_cliente}')
-        yield env.timeout(abs(self._rnd.normal(0.7, scale=0.3)))
+            # [Atividade] Coleta do pedido
+            # Funcionários atendem o pedido em 0,7min com desvio de 0,3min
+            log(f'coleta pedido {id_pedido} do cliente {id_cliente}')
+            yield env.timeout(self._amostrador_atendimento.proximo())
 
-        self._store_funcionarios.put(funcionario)
+            self._funcionarios_livres.append(funcionario)
 
     def _processa_funcionario__preparo(self, env: simpy.Environment, copo_cliente: Copo | None) -> sd.Generator:
-        # (Fila) Aguarda funcionário
-        funcionario: Funcionario = yield self._store_funcionarios.get()
-        # [Atividade] Ocupa funcionário
-        log = functools.partial(self._log, env, f'funcionário {funcionario.id}')
+        with self._resource_funcionarios.request() as request_funcionario:
+            # (Fila) Aguarda funcionário
+            yield request_funcionario
+            # [Atividade] Ocupa funcionário
+            funcionario = self._funcionarios_livres.pop()
+            log = self._cria_log(env, f'funcionário {funcionario.id}')
 
-        tempo_inicial_preparo = env.now
+            tempo_inicial_preparo = env.now
 
-        copo: Copo
-        # Se o cliente ainda não possuir um copo
-        if copo_cliente is None:
-            # (Fila) Aguarda copo
-            novo_copo = yield self._store_copos.get()
+            copo: Copo
+            # Se o cliente ainda não possuir um copo
+            if copo_cliente is None:
+                # (Fila) Aguarda copo
+                novo_copo = yield self._store_copos.get()
 
-            # [Atividade] Ocupa copo
-            log('ocupa copo')
-            copo = novo_copo
+                # [Atividade] Ocupa copo
+                log('ocupa copo')
+                copo = novo_copo
 
-        # Copo reutilizado do último pedido do cliente
-        else:
-            copo = copo_cliente
+            # Copo reutilizado do último pedido do cliente
+            else:
+                copo = copo_cliente
 
-        if not copo.limpo:
-            with self._resource_lavagem.request() as request_lavagem:
-                # (Fila) Aguarda pia
-                yield request_lavagem
+            if not copo.limpo:
+                with self._resource_lavagem.request() as request_lavagem:
+                    # (Fila) Aguarda pia
+                    yield request_lavagem
 
-                # [Atividade] Lava copo
-                yield env.timeout(0)
-                log('lava copo')
+                    # [Atividade] Lava copo
+                    # (instantânea, então não gera nenhum evento na simulação)
+                    log('lava copo')
 
-            copo.limpo = True
+                copo.limpo = True
 
-        # (Fila) Aguarda freezer ficar disponível
-        yield env.timeout(0)  # delay=0, pois o freezer sempre está disponível
+            # (Fila) Aguarda freezer ficar disponível
+            # Sem espera (e sem evento na simulação), pois o freezer sempre está disponível
 
-        # [Atividade] Coloca no freezer
-        # Funcionários lavam o copo e colocam no freezer em 0,5min com desvio de 0,1min
-        yield env.timeout(abs(self._rnd.normal(0.5, scale=0.1)))
-        log('coloca copo no freezer')
+            # [Atividade] Coloca no freezer
+            # Funcionários lavam o copo e colocam no freezer em 0,5min com desvio de 0,1min
+            yield env.timeout(self._amostrador_freezer.proximo())
+            log('coloca copo no freezer')
 
-        # Desocupa funcionário
-        yield self._store_funcionarios.put(funcionario)
+            # Desocupa funcionário
+            self._funcionarios_livres.append(funcionario)
 
         # (Fila) Aguarda copo congelar
         # O copo deve ficar no freezer por 4min antes de ser usado para servir
@@ -213,17 +250,19 @@ class ModeloBarExpresso(metaclass=sd.ModeloMetaclass):
         return copo
 
     def _processa_funcionario__retirada(self, env: simpy.Environment, retirada: Retirada) -> sd.Generator:
-        # (Fila) Aguarda funcionário
-        funcionario: Funcionario = yield self._store_funcionarios.get()
-        log = functools.partial(self._log, env, f'funcionário {funcionario.id}')
+        with self._resource_funcionarios.request() as request_funcionario:
+            # (Fila) Aguarda funcionário
+            yield request_funcionario
+            funcionario = self._funcionarios_livres.pop()
+            log = self._cria_log(env, f'funcionário {funcionario.id}')
 
-        # [Atividade] Recolhe o copo da mesa
-        log(f'recolhe o copo da mesa do cliente {retirada.id_cliente}')
-        yield env.timeout(abs(self._rnd.normal(0.7, scale=0.3)))
+            # [Atividade] Recolhe o copo da mesa
+            log(f'recolhe o copo da mesa do cliente {retirada.id_cliente}')
+            yield env.timeout(self._amostrador_atendimento.proximo())
 
-        self._store_copos.put(retirada.copo)
+            self._store_copos.put(retirada.copo)
 
-        self._store_funcionarios.put(funcionario)
+            self._funcionarios_livres.append(funcionario)
 
 
 def main() -> None:
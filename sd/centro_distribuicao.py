@@ -1,114 +1,87 @@
 import dataclasses
-import datetime
-import enum
-import functools
+import itertools
 import random
 import typing
 
-import arrow
 import numpy as np
 import simpy
 
 import sd
-from sd import Modelo
 
 
 def generate_random_integers(n: int, x: int) -> list[int]:
     if n == 1:
         return [x]
 
-    # Generate n-1 random boundaries between 0 and x
-    boundaries = sorted(random.randint(0, x) for _ in range(n - 1))
+    # Generate n-1 random boundaries between 0 and x, in a single call
+    boundaries = sorted(random.choices(range(x + 1), k=n - 1))
 
-    # Calculate the differences between the boundaries
-    random_integers = [boundaries[0]] + \
-                      [boundaries[i] - boundaries[i - 1] for i in range(1, n - 1)] + \
-                      [x - boundaries[-1]]
+    # Calculate the differences between consecutive boundaries (including 0 and x)
+    return [b - a for a, b in itertools.pairwise([0, *boundaries, x])]
 
-    return random_integers
 
+def _divide(values: list[float], n: int) -> list[list[float]]:
+    # Mesma divisão de `np.array_split`, em que as `len(values) % n` primeiras partes recebem um valor a mais,
+    # mas por fatias da própria lista, sem convertê-la para um array e de volta
+    tamanho, resto = divmod(len(values), n)
+    partes = []
+    inicio = 0
+    for i in range(n):
+        fim = inicio + tamanho + (1 if i < resto else 0)
+        partes.append(values[inicio:fim])
+        inicio = fim
+    return partes
 
-@dataclasses.dataclass(frozen=True, kw_only=True)
+
+@dataclasses.dataclass(frozen=True, kw_only=True, slots=True)
 class Van:
     id: int
 
 
 def _f(values: list[int], valor_max: int) -> list[int] | None:
-    for i in range(len(values)):
-        valores_prefixo = values[:i + 1]
-        soma_prefixo = sum(valores_prefixo)
+    # Soma do prefixo acumulada, em vez de recalculada a cada posição
+    soma_prefixo = 0
+    for i, value in enumerate(values):
+        soma_prefixo += value
         if soma_prefixo < valor_max:
             continue
-        i = -1 if soma_prefixo > valor_max else None
-        return valores_prefixo[:i]
+        return values[:i] if soma_prefixo > valor_max else values[:i + 1]
     return None
 
 
-class _Metrica(enum.Enum):
-    TEMPO_ESPERA_ESTACIONAR = 0
-    TEMPO_ESPERA_ABERTURA = 1
-    TEMPO_ESPERA_DESCARREGAR = 2
-    TEMPO_DESCARREGAR = 3
-    TEMPO_ESPERA_AREA_CARGA = 4
-    TEMPO_ESPERA_CARREGAR = 5
-    TEMPO_CARREGAR = 6
-
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Carregamento:
     volumes: list[float]
     evento_conclusao: simpy.Event
 
 
-class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
-    @dataclasses.dataclass(kw_only=True)
-    class _Estatisticas:
-        tempos_espera_estacionar: list[float]
-        tempos_espera_abertura: list[float]
-        tempos_espera_descarregar: list[float]
-        tempos_descarregar: list[float]
-        tempos_espera_area_carga: list[float]
-        tempos_espera_carregar: list[float]
-        tempos_carregar: list[float]
-
-    @typing.override
-    def calcula_metrica(self, metrica: _Metrica) -> list[float]:
-        match metrica:
-            case _Metrica.TEMPO_ESPERA_ESTACIONAR:
-                return self._estatisticas.tempos_espera_estacionar
-            case _Metrica.TEMPO_ESPERA_ABERTURA:
-                return self._estatisticas.tempos_espera_abertura
-            case _Metrica.TEMPO_ESPERA_DESCARREGAR:
-                return self._estatisticas.tempos_espera_descarregar
-            case _Metrica.TEMPO_DESCARREGAR:
-                return self._estatisticas.tempos_descarregar
-            case _Metrica.TEMPO_ESPERA_AREA_CARGA:
-                return self._estatisticas.tempos_espera_area_carga
-            case _Metrica.TEMPO_ESPERA_CARREGAR:
-                return self._estatisticas.tempos_espera_carregar
-            case _Metrica.TEMPO_CARREGAR:
-                return self._estatisticas.tempos_carregar
-            case _:
-                typing.assert_never(metrica)
-
-    _estatisticas: _Estatisticas
-
-    _qtd_max_caminhoes: int
-    _qtd_vans: int
-    _qtd_funcionarios: int
-    _tamanho_caminhao: int
-    _tamanho_van: int
-    _tamanho_deposito: int
-    _velocidade_descarga: int
-    _velocidade_carga: int
-
-    _hora_inicio_funcionamento: int
-    # A empresa funciona 8h por dia para carga e descarga
+class ModeloCentroDistribuicao(metaclass=sd.ModeloMetaclass):
+    # Configuração do modelo
+    chave_modelo: str = 'centro-distribuicao'
+    unidade_tempo: str = 'horas'
+
+    _qtd_max_caminhoes: int = sd.ParametroModelo(chave='qtd-caminhoes', padrao=5)
+    _qtd_vans: int = sd.ParametroModelo(chave='qtd-vans', padrao=4)
+    _qtd_funcionarios: int = sd.ParametroModelo(chave='qtd-funcionarios', padrao=6)
+    _tamanho_caminhao: int = sd.ParametroModelo(chave='tamanho-caminhao', padrao=20)
+    _tamanho_van: int = sd.ParametroModelo(chave='tamanho-van', padrao=8)
+    _tamanho_deposito: int = sd.ParametroModelo(chave='tamanho-deposito', padrao=300)
+    _velocidade_descarga: int = sd.ParametroModelo(chave='velocidade-descarga', padrao=12)
+    _velocidade_carga: int = sd.ParametroModelo(chave='velocidade-carga', padrao=20)
+
+    _tempos_espera_estacionar: list[float] = sd.MetricaModelo(descricao='Espera p/ estacionar (caminhão)')
+    _tempos_espera_abertura: list[float] = sd.MetricaModelo(descricao='Espera p/ abrir (caminhão)')
+    _tempos_espera_descarregar: list[float] = sd.MetricaModelo(descricao='Espera p/ área de descarga (caminhão)')
+    _tempos_descarregar: list[float] = sd.MetricaModelo(descricao='Descarregar (caminhão)')
+    _tempos_espera_area_carga: list[float] = sd.MetricaModelo(descricao='Espera p/ área de carga (van)')
+    _tempos_espera_carregar: list[float] = sd.MetricaModelo(descricao='Espera p/ carregar (van)')
+    _tempos_carregar: list[float] = sd.MetricaModelo(descricao='Carregar (van)')
+
+    # A empresa abre às 8h e funciona 8h por dia para carga e descarga
+    _hora_inicio_funcionamento: typing.Final[int] = 8
     _duracao_funcionamento: typing.Final[int] = 8
-
-    @property
-    def _hora_final_funcionamento(self):
-        return self._hora_inicio_funcionamento + self._duracao_funcionamento
+    # Calculada uma única vez, já que é consultada a cada caminhão e a cada carregamento
+    _hora_final_funcionamento: int
 
     _resource_descarga_caminhoes: simpy.Resource
     _resource_estacionamento_caminhoes: simpy.Resource
@@ -123,45 +96,23 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
     _evento_finalizar_carga: simpy.Event
     _evento_finalizar_descarga: simpy.Event
 
-    def __init__(
-            self,
-            *,
-            seed: int | None = None,
-            deve_exibir_log: bool = False,
-            qtd_max_caminhoes: int,
-            qtd_vans: int,
-            qtd_funcionarios: int,
-            tamanho_caminhao: int,
-            tamanho_van: int,
-            tamanho_deposito: int,
-            velocidade_descarga: int,
-            velocidade_carga: int,
-    ) -> None:
-        super().__init__(
-            seed=seed,
-            deve_exibir_log=deve_exibir_log,
-        )
-        self._hora_inicio_funcionamento = 8  # 08AM
-        self._qtd_max_caminhoes = qtd_max_caminhoes
-        self._qtd_vans = qtd_vans
-        self._qtd_funcionarios = qtd_funcionarios
-        self._tamanho_caminhao = tamanho_caminhao
-        self._tamanho_van = tamanho_van
-        self._tamanho_deposito = tamanho_deposito
-        self._velocidade_descarga = velocidade_descarga
-        self._velocidade_carga = velocidade_carga
-
-    @typing.override
-    def inicia(self, env: simpy.Environment) -> None:
-        self._estatisticas = ModeloCentroDistribuicao._Estatisticas(
-            tempos_espera_estacionar=[],
-            tempos_espera_abertura=[],
-            tempos_espera_descarregar=[],
-            tempos_descarregar=[],
-            tempos_espera_area_carga=[],
-            tempos_espera_carregar=[],
-            tempos_carregar=[],
-        )
+    _amostrador_volume: sd.Amostrador
+    _amostrador_chegada_caminhao: sd.Amostrador
+    _amostrador_entrega: sd.Amostrador
+
+    def executa(self, env: simpy.Environment) -> None:
+        self._hora_final_funcionamento = self._hora_inicio_funcionamento + self._duracao_funcionamento
+
+        # Distribuições sorteadas em lotes
+        rnd = self._rnd
+        # O volume das encomendas varia de acordo com uma função de probabilidade
+        # triangular com no mínimo 0,03m³, volume mais provável 0,12m³ e volume máximo de 1m³
+        self._amostrador_volume = sd.Amostrador(lambda n: rnd.triangular(left=0.03, mode=0.12, right=1, size=n))
+        # Chegam caminhões em média a cada 15h segundo uma distribuição exponencial
+        self._amostrador_chegada_caminhao = sd.Amostrador(lambda n: rnd.exponential(scale=15, size=n))
+        # A van passa em média 4 horas, com distribuição normal e desvio de 1 hora, para finalizar as entregas.
+        # O valor absoluto (normal "dobrada") evita durações negativas, que ocorrem com probabilidade ~0,003%
+        self._amostrador_entrega = sd.Amostrador(lambda n: np.abs(rnd.normal(loc=4, scale=1, size=n)))
 
         # O depósito pode armazenar 300m³
         self._store_deposito = simpy.Store(env)
@@ -191,26 +142,31 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
     _store_eventos_carregamento: simpy.Store
 
     def _processa_funcionarios__(self, env: simpy.Environment) -> sd.Generator:
-        log = functools.partial(self._log, env, f'equipe')
+        log = self._cria_log(env, 'equipe')
         while True:
             volumes: list[float] = []
-            while sum(volumes) < self._tamanho_van:
+            # Volume total acumulado, em vez de somar `volumes` a cada nova caixa
+            volume_total = 0.0
+            while volume_total < self._tamanho_van:
                 volume = yield self._store_deposito.get()
+                # O volume da caixa já entrou no container, mas o nível acumulado em ponto flutuante pode
+                # ficar alguns ULP abaixo dele; a retirada é aguardada para não ser atendida só por um
+                # `put` posterior, consumindo o espaço de outra caixa
                 yield self._container_deposito.get(volume)
                 volumes.append(volume)
+                volume_total += volume
 
             if True:
                 # Existem caixas o suficiente no depósito para carregar uma van
 
-                dt_hoje = arrow.get(datetime.datetime.now().date())
-                dt_agora = dt_hoje.shift(hours=env.now % 24)
-                dt_maximo = dt_hoje.replace(hour=self._hora_final_funcionamento)
-                dt_fim_carga = dt_agora.shift(hours=len(volumes) / self._qtd_funcionarios / self._velocidade_carga)
+                # Horários calculados em horas do dia, sem construir datas
+                hora_agora = env.now % 24
+                hora_fim_carga = hora_agora + len(volumes) / self._qtd_funcionarios / self._velocidade_carga
 
-                if dt_fim_carga <= dt_maximo:
+                if hora_fim_carga <= self._hora_final_funcionamento:
                     # Uma carga só pode começar se ela for terminar
                     # antes do horário de término do serviço
-                    log(f'aprova carregamento de {len(volumes)} caixas, com {sum(volumes):.2f} m³')
+                    log(f'aprova carregamento de {len(volumes)} caixas, com {volume_total:.2f} m³')
 
                     carregamento = Carregamento(
                         volumes=volumes,
@@ -219,7 +175,8 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
                     yield self._store_eventos_carregamento.put(carregamento)
                     yield carregamento.evento_conclusao
                 else:
-                    log(f'recusa carregamento, irá terminar às {dt_fim_carga.format('HH:mm')}')
+                    horas_fim_carga, minutos_fim_carga = divmod(int(hora_fim_carga * 60), 60)
+                    log(f'recusa carregamento, irá terminar às {horas_fim_carga % 24:02d}:{minutos_fim_carga:02d}')
 
     def _executa_funcionarios__descarga(
             self,
@@ -227,8 +184,8 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
             volumes: list[float],
             qtd_funcionarios: int = 6,
     ) -> sd.Generator:
-        log = functools.partial(self._log, env, f'equipe({qtd_funcionarios})')
-        volumes_funcionario = [list(arr) for arr in np.array_split(volumes, qtd_funcionarios)]
+        log = self._cria_log(env, f'equipe({qtd_funcionarios})')
+        volumes_funcionario = _divide(volumes, qtd_funcionarios)
         log(f'inicia descarregamento de caixas: ({[len(v) for v in volumes_funcionario]})')
         yield simpy.events.AllOf(env, [
             env.process(self._processa_funcionario__descarga(env, volumes))
@@ -238,7 +195,9 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
         # Colocam no depósito
         for volume in volumes:
             yield self._container_deposito.put(volume)
-            yield self._store_deposito.put(volume)
+            # O depósito não tem limite de caixas (apenas de volume, controlado pelo container),
+            # então a inserção é sempre imediata e não precisa suspender o processo
+            self._store_deposito.put(volume)
         log(f'coloca {len(volumes)} caixas no depósito')
 
         self._evento_finalizar_descarga.succeed()
@@ -251,7 +210,7 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
             volumes: list[float],
             qtd_funcionarios: int = 6,
     ) -> sd.Generator:
-        volumes_funcionario = [list(arr) for arr in np.array_split(volumes, qtd_funcionarios)]
+        volumes_funcionario = _divide(volumes, qtd_funcionarios)
         self._log(env,
                   f"equipe({qtd_funcionarios}): inicia carregamento de caixas ({[len(v) for v in volumes_funcionario]})")
         yield simpy.events.AllOf(env, [
@@ -265,29 +224,36 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
     def _processa_funcionarios__carregamento(self, env: simpy.Environment):
         while True:
             # Aguarda ter algum evento de carga ou descarga
-            eventos = yield self._evento_iniciar_carga | self._evento_iniciar_descarga
-            match dict(eventos):
-                # Caso ocorra um evento apenas de descarga
-                case {self._evento_iniciar_descarga: volumes_descarga}:
-                    yield env.process(self._executa_funcionarios__descarga(env, volumes_descarga, 6))
-
-                # Caso ocorra um evento apenas de carga
-                case {self._evento_iniciar_carga: volumes_carga}:
-                    yield env.process(self._executa_funcionarios__carga(env, volumes_carga, 6))
-
-                # Caso ocorra um evento de descarga e de carga ao mesmo tempo
-                case {self._evento_iniciar_descarga: volumes_descarga, self._evento_iniciar_carga: volumes_carga}:
-                    self._log(env, "equipe: carrega/descarrega caixas")
-                    yield simpy.AllOf(env, [
-                        env.process(self._executa_funcionarios__descarga(env, volumes_descarga, 4)),
-                        env.process(self._executa_funcionarios__carga(env, volumes_carga, 2)),
-                    ])
+            evento_carga = self._evento_iniciar_carga
+            evento_descarga = self._evento_iniciar_descarga
+            yield evento_carga | evento_descarga
+
+            # Os eventos que dispararam a condição são os já processados, consultados
+            # diretamente em vez de copiar os valores da condição para um dicionário
+            deve_carregar = evento_carga.processed
+            deve_descarregar = evento_descarga.processed
+
+            # Caso ocorra um evento de descarga e de carga ao mesmo tempo
+            if deve_descarregar and deve_carregar:
+                self._log(env, "equipe: carrega/descarrega caixas")
+                yield simpy.AllOf(env, [
+                    env.process(self._executa_funcionarios__descarga(env, evento_descarga.value, 4)),
+                    env.process(self._executa_funcionarios__carga(env, evento_carga.value, 2)),
+                ])
+
+            # Caso ocorra um evento apenas de descarga
+            elif deve_descarregar:
+                yield env.process(self._executa_funcionarios__descarga(env, evento_descarga.value, 6))
+
+            # Caso ocorra um evento apenas de carga
+            else:
+                yield env.process(self._executa_funcionarios__carga(env, evento_carga.value, 6))
 
     def _processa_funcionario__descarga(self, env: simpy.Environment, volumes: list[float]) -> sd.Generator:
-        for _ in volumes:
-            # Um funcionário é capaz de descarregar 12 caixas
-            # (independente do volume) por hora do caminhão
-            yield env.timeout(1 / self._velocidade_descarga)
+        # Um funcionário é capaz de descarregar 12 caixas
+        # (independente do volume) por hora do caminhão. Como ninguém observa cada
+        # caixa individualmente, o tempo de todas as caixas é aguardado de uma vez
+        yield env.timeout(len(volumes) / self._velocidade_descarga)
 
     def _processa_funcionario__carga(self, env: simpy.Environment, volumes: list[float]) -> sd.Generator:
         # Um funcionário é capaz de carregar 20 caixas por hora na van
@@ -295,32 +261,46 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
 
     _evento_iniciar_carregamento: simpy.Event
 
-    @typing.override
     def _log(self, env: simpy.Environment, *args: str) -> None:
-        if self._deve_exibir_log:
-            now = env.now
-            dia = int(now / 24) + 1
-            dt = arrow.get(datetime.datetime.now().date()).shift(hours=now % 24)
-            print(f'dia {dia}', dt.format('HH[h]mm'), *args, sep=': ')
+        now = env.now
+        dia = int(now / 24) + 1
+        # Horário no formato `HH[h]mm`, calculado diretamente a partir da hora do dia
+        horas, minutos = divmod(int(now % 24 * 60), 60)
+        print(f'dia {dia}', f'{horas:02d}h{minutos:02d}', *args, sep=': ')
+
+    def exibe_estado(self) -> None:
+        cls = type(self)
+        for field_name, metrica in cls._get_time_metrics().items():
+            valores = getattr(self, field_name)
+            # Cada caminhão descarregado e cada van carregada registram exatamente um tempo
+            if field_name == '_tempos_descarregar':
+                print(f'Número de caminhões: {len(valores)}')
+            elif field_name == '_tempos_carregar':
+                print(f'Número de entregas: {len(valores)}')
+            cls._log_stats(metrica.descricao, valores)
 
     def _processa_van(self, env: simpy.Environment, van: Van) -> sd.Generator:
-        log = functools.partial(self._log, env, f'van {van.id}')
+        log = self._cria_log(env, f'van {van.id}')
+        # Métodos usados a cada entrega, resolvidos uma única vez
+        timeout = env.timeout
+        request_carga_van = self._resource_carga_vans.request
+        proxima_entrega = self._amostrador_entrega.proximo
         while True:
-            with self._resource_carga_vans.request() as request_carga:
+            with request_carga_van() as request_carga:
                 # (Fila) Aguarda ponto de carga estar desocupado
                 tempo_inicial_area_carga = env.now
                 yield request_carga
-                self._estatisticas.tempos_espera_area_carga.append(env.now - tempo_inicial_area_carga)
+                self._tempos_espera_area_carga.append(env.now - tempo_inicial_area_carga)
 
                 # [Atividade] Ocupa ponto de carga
+                # (instantânea, então não gera nenhum evento na simulação)
                 log('ocupa ponto de carga')
-                yield env.timeout(0)
 
                 log('aguarda itens o suficiente para iniciar carregamento')
                 # (Fila) Aguarda itens o suficiente para serem carregados
                 tempo_inicial_espera_carregar = env.now
                 carregamento: Carregamento = yield self._store_eventos_carregamento.get()
-                self._estatisticas.tempos_espera_carregar.append(env.now - tempo_inicial_espera_carregar)
+                self._tempos_espera_carregar.append(env.now - tempo_inicial_espera_carregar)
 
                 # [Atividade] Ocupa itens a serem carregados
 
@@ -329,7 +309,7 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
                 self._evento_iniciar_carga.succeed(value=carregamento.volumes)
                 tempo_inicial_carregar = env.now
                 yield self._evento_finalizar_carga
-                self._estatisticas.tempos_carregar.append(env.now - tempo_inicial_carregar)
+                self._tempos_carregar.append(env.now - tempo_inicial_carregar)
 
                 carregamento.evento_conclusao.succeed()
 
@@ -337,38 +317,46 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
             # A van passa em média 4 horas, com distribuição normal e desvio
             # de 1 hora, para finalizar as entregas aos destinatários
             log('sai para a entrega')
-            yield env.timeout(abs(self._rnd.normal(loc=4, scale=1)))
+            yield timeout(proxima_entrega())
             log('chega da entrega')
 
     def _processa_caminhao(self, env: simpy.Environment) -> sd.Generator:
-        log = functools.partial(self._log, env, 'caminhão')
+        log = self._cria_log(env, 'caminhão')
+        # Métodos usados a cada caminhão, resolvidos uma única vez
+        timeout = env.timeout
+        proximo_volume = self._amostrador_volume.proximo
+        proxima_chegada = self._amostrador_chegada_caminhao.proximo
         while True:
             volumes: list[float] = []
+            # Volume total acumulado, em vez de somar `volumes` a cada nova caixa
+            volume_total = 0.0
             while True:
                 # O volume das encomendas varia de acordo com uma função de probabilidade
                 # triangular com no mínimo 0,03m³, volume mais provável 0,12m³ e volume máximo de 1m³
-                volume = self._rnd.triangular(left=0.03, mode=0.12, right=1)
+                volume = proximo_volume()
 
                 # Um caminhão tem a capacidade máxima de 20m³, mas
                 # não vem necessariamente na capacidade total
-                if sum(volumes) + volume > self._tamanho_caminhao:
+                if volume_total + volume > self._tamanho_caminhao:
                     break
 
                 volumes.append(volume)
+                volume_total += volume
 
             # Chegam caminhões em média a cada 15h segundo uma
             # distribuição exponencial (a qualquer hora do dia)
-            yield env.timeout(self._rnd.exponential(scale=15))
+            yield timeout(proxima_chegada())
 
-            log(f'chega no centro com {len(volumes)} caixas, total {sum(volumes):.2f} m³')
+            log(f'chega no centro com {len(volumes)} caixas, total {volume_total:.2f} m³')
             with self._resource_estacionamento_caminhoes.request() as request_estacionamento:
                 tempo_inicial_caminhao_espera_vaga = env.now
                 # (Fila) Aguarda vaga no estacionamento
                 yield request_estacionamento
-                self._estatisticas.tempos_espera_estacionar.append(env.now - tempo_inicial_caminhao_espera_vaga)
+                self._tempos_espera_estacionar.append(env.now - tempo_inicial_caminhao_espera_vaga)
 
                 # [Atividade] Estaciona
-                yield env.timeout(0)  # TODO Adicionar como demanda ausente
+                # (instantânea, então não gera nenhum evento na simulação)
+                # TODO Adicionar como demanda ausente
                 log('estaciona')
 
                 # (Fila) Aguarda centro de distribuição abrir
@@ -385,24 +373,26 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
                 else:
                     tempo_aguardo_abertura = 0
 
+                tempo_inicial_caminhao_espera_abertura = env.now
+                # Sem espera, o caminhão segue sem gerar nenhum evento na simulação
                 if tempo_aguardo_abertura > 0:
                     log(f'aguarda ~{tempo_aguardo_abertura:.0f}h para descarregar')
-                tempo_inicial_caminhao_espera_abertura = env.now
-                yield env.timeout(tempo_aguardo_abertura)
-                self._estatisticas.tempos_espera_abertura.append(env.now - tempo_inicial_caminhao_espera_abertura)
+                    yield timeout(tempo_aguardo_abertura)
+                self._tempos_espera_abertura.append(env.now - tempo_inicial_caminhao_espera_abertura)
 
                 # [Atividade] Libera descarregamento
-                yield env.timeout(0)  # TODO Adicionar como demanda ausente
+                # (instantânea, então não gera nenhum evento na simulação)
+                # TODO Adicionar como demanda ausente
 
                 log('aguarda vaga para descarregar')
                 with self._resource_descarga_caminhoes.request() as request_descarga:
                     # (Fila) Aguarda área de descarga
                     tempo_inicial_caminhao_espera_area = env.now
                     yield request_descarga
-                    self._estatisticas.tempos_espera_descarregar.append(env.now - tempo_inicial_caminhao_espera_area)
+                    self._tempos_espera_descarregar.append(env.now - tempo_inicial_caminhao_espera_area)
 
                     # [Atividade] Ocupa área de descarga
-                    yield env.timeout(0)
+                    # (instantânea, então não gera nenhum evento na simulação)
 
                     log('aguarda equipe descarregar')
                     self._evento_iniciar_descarga.succeed(value=volumes)
@@ -410,80 +400,12 @@ class ModeloCentroDistribuicao(sd.Modelo[_Metrica]):
 
                     tempo_inicial_descarregar_caminhao = env.now
                     yield self._evento_finalizar_descarga
-                    self._estatisticas.tempos_descarregar.append(
+                    self._tempos_descarregar.append(
                         env.now - tempo_inicial_descarregar_caminhao)
 
 
-class ExecutorCentroDistribuicao(sd.ExecutorModelo[_Metrica]):
-    def inicializa_modelo(
-            self,
-            dados_modelos: dict[str, dict[str, typing.Any]],
-            seed: int | None,
-            deve_exibir_log: bool,
-    ) -> Modelo[_Metrica]:
-        dados_modelo = dados_modelos.get('centro-distribuicao', {})
-        qtd_max_caminhoes = dados_modelo.get('qtd-caminhoes', 5)
-        qtd_vans = dados_modelo.get('qtd-vans', 4)
-        qtd_funcionarios = dados_modelo.get('qtd-funcionarios', 6)
-        tamanho_caminhao = dados_modelo.get('tamanho-caminhao', 20)
-        tamanho_van = dados_modelo.get('tamanho-van', 8)
-        tamanho_deposito = dados_modelo.get('tamanho-deposito', 300)
-        velocidade_descarga = dados_modelo.get('velocidade-descarga', 12)
-        velocidade_carga = dados_modelo.get('velocidade-carga', 20)
-        return ModeloCentroDistribuicao(
-            seed=seed,
-            deve_exibir_log=deve_exibir_log,
-            qtd_max_caminhoes=qtd_max_caminhoes,
-            qtd_vans=qtd_vans,
-            qtd_funcionarios=qtd_funcionarios,
-            tamanho_caminhao=tamanho_caminhao,
-            tamanho_van=tamanho_van,
-            tamanho_deposito=tamanho_deposito,
-            velocidade_carga=velocidade_carga,
-            velocidade_descarga=velocidade_descarga,
-        )
-
-    def lista_metricas(self) -> typing.Sequence[_Metrica]:
-        return list(_Metrica)
-
-    def exibe_modelo_executado(self, modelo: Modelo[_Metrica]) -> None:
-        for metrica in self.lista_metricas():
-            valores = modelo.calcula_metrica(metrica)
-            if metrica == _Metrica.TEMPO_DESCARREGAR:
-                print(f'Número de caminhões: {len(valores)}')
-            elif metrica == _Metrica.TEMPO_CARREGAR:
-                print(f'Número de entregas: {len(valores)}')
-            label = self.descreve_metrica(metrica)
-            self._log_stats(label, valores)
-
-    def descreve_metrica(self, metrica: _Metrica) -> str:
-        match metrica:
-            case _Metrica.TEMPO_ESPERA_ESTACIONAR:
-                return 'Espera p/ estacionar (caminhão)'
-            case _Metrica.TEMPO_ESPERA_ABERTURA:
-                return 'Espera p/ abrir (caminhão)'
-            case _Metrica.TEMPO_ESPERA_DESCARREGAR:
-                return 'Espera p/ área de descarga (caminhão)'
-            case _Metrica.TEMPO_DESCARREGAR:
-                return 'Descarregar (caminhão)'
-            case _Metrica.TEMPO_ESPERA_AREA_CARGA:
-                return 'Espera p/ área de carga (van)'
-            case _Metrica.TEMPO_ESPERA_CARREGAR:
-                return 'Espera p/ carregar (van)'
-            case _Metrica.TEMPO_CARREGAR:
-                return 'Carregar (van)'
-            case _:
-                typing.assert_never(metrica)
-
-
 def main() -> None:
-    executor = ExecutorCentroDistribuicao()
-    sd.executa_script(
-        executor,
-        x_range=(1 * 24, 5 * 24, 12),
-        y_range=(0, 5, 1),
-        time_unit='hours',
-    )
+    sd.executa_script(ModeloCentroDistribuicao, x_range=(1 * 24, 5 * 24, 12), y_range=(0, 5, 1))
 
 
 if __name__ == '__main__':
@@ -1,35 +1,66 @@
 import itertools
-import random
 import typing
 import numpy.random
 import simpy
 import simpy.resources.resource
 
+import sd
+
 
 class ModeloClinicaMedica:
     _env: simpy.Environment
     _rnd: numpy.random.Generator
     _resource_medicos: simpy.Resource
     _resource_recepcionistas: simpy.Resource
+    _amostrador_chegada: sd.Amostrador
+    _amostrador_ficha: sd.Amostrador
+    _amostrador_consulta: sd.Amostrador
+    _amostrador_pagamento: sd.Amostrador
 
     # Variáveis para rastreamento de tempos
-    _tempo_total_chegada = 0
-    _tempo_total_recepcionista_1 = 0
-    _tempo_total_ficha = 0
-    _tempo_total_consulta = 0
-    _tempo_total_recepcionista_2 = 0
-    _tempo_total_pagamento = 0
-    _num_eventos = 0
-    _ultimo_tempo_chegada = 0
-
-    def __init__(self, env: simpy.Environment):
+    _tempo_total_chegada: float
+    _tempo_total_recepcionista_1: float
+    _tempo_total_ficha: float
+    _tempo_total_consulta: float
+    _tempo_total_recepcionista_2: float
+    _tempo_total_pagamento: float
+    _num_eventos: int
+    _ultimo_tempo_chegada: float
+
+    def __init__(self, env: simpy.Environment, *, deve_exibir_log: bool = False):
         self._env = env
-        self._rnd = numpy.random.default_rng()
+        # Mesmo gerador de bits dos demais modelos (SFC64), mais rápido que o PCG64 padrão de `default_rng`
+        self._rnd = numpy.random.Generator(numpy.random.SFC64())
+        sd.configura_log(self, deve_exibir_log)
+
+        # Distribuições sorteadas em lotes
+        rnd = self._rnd
+        # Chegada média de 3 minutos
+        self._amostrador_chegada = sd.Amostrador(lambda n: rnd.exponential(3, size=n))
+        # Preenchimento da ficha em média de 10 minutos
+        self._amostrador_ficha = sd.Amostrador(lambda n: rnd.exponential(10, size=n))
+        # Consulta em média de 20 minutos
+        self._amostrador_consulta = sd.Amostrador(lambda n: rnd.exponential(20, size=n))
+        # Pagamento e agendamento entre 1 e 4 minutos
+        self._amostrador_pagamento = sd.Amostrador(lambda n: rnd.uniform(1, 4, size=n))
+
+        # Totais inicializados na própria instância, em vez de herdados dos atributos da classe no primeiro `+=`
+        self._tempo_total_chegada = 0.0
+        self._tempo_total_recepcionista_1 = 0.0
+        self._tempo_total_ficha = 0.0
+        self._tempo_total_consulta = 0.0
+        self._tempo_total_recepcionista_2 = 0.0
+        self._tempo_total_pagamento = 0.0
+        self._num_eventos = 0
+        self._ultimo_tempo_chegada = 0.0
 
         # Recursos
         self._resource_medicos = simpy.Resource(env, capacity=3)
         self._resource_recepcionistas = simpy.Resource(env, capacity=2)
 
+    def _log(self, *args: str) -> None:
+        print(f'{self._env.now:04.1f}:', *args)
+
     def inicia(self) -> typing.Generator[simpy.Event, None, None]:
         # Processos de pacientes
         for id_paciente in itertools.count(start=1):
@@ -39,65 +70,66 @@ class ModeloClinicaMedica:
                 self._tempo_total_chegada += tempo_entre_chegadas
             self._ultimo_tempo_chegada = chegada
 
-            print(f'{chegada:04.1f}: Paciente {id_paciente:02d} chega na clínica')
+            self._log(f'Paciente {id_paciente:02d}', 'chega na clínica')
             self._env.process(self._processo_atendimento(id_paciente))
 
             # Chegada média de 3 minutos
-            yield self._env.timeout(self._rnd.exponential(3))
+            yield self._env.timeout(self._amostrador_chegada.proximo())
 
     def _processo_atendimento(self, id_paciente: int) -> typing.Generator[simpy.Event, None, None]:
-        tempo_inicio = self._env.now
+        # Ambiente e métodos usados em todas as etapas do paciente, resolvidos uma única vez
+        env = self._env
+        timeout = env.timeout
+        paciente = f'Paciente {id_paciente:02d}'
 
         # Atendimento na recepcionista 1
-        tempo_recepcionista_inicio = self._env.now
+        tempo_recepcionista_inicio = env.now
         with self._resource_recepcionistas.request() as request_recepcionista:
             # Aguarda recepcionista livre
             yield request_recepcionista
 
             # Preenche a ficha
-            print(f'{self._env.now:04.1f}: Paciente {id_paciente:02d} preenche a ficha')
-            tempo_ficha_inicio = self._env.now
-            yield self._env.timeout(self._rnd.exponential(10))
-            tempo_ficha_fim = self._env.now
-            print(f'{self._env.now:04.1f}: Paciente {id_paciente:02d} terminou de preencher a ficha')
-        tempo_recepcionista_fim = self._env.now
+            self._log(paciente, 'preenche a ficha')
+            tempo_ficha_inicio = env.now
+            yield timeout(self._amostrador_ficha.proximo())
+            tempo_ficha_fim = env.now
+            self._log(paciente, 'terminou de preencher a ficha')
+        tempo_recepcionista_fim = env.now
         self._tempo_total_recepcionista_1 += (tempo_recepcionista_fim - tempo_recepcionista_inicio)
 
         # Tempo de preenchimento da ficha
         self._tempo_total_ficha += (tempo_ficha_fim - tempo_ficha_inicio)
 
         # Consulta com o médico
-        tempo_consulta_inicio = self._env.now
+        tempo_consulta_inicio = env.now
         with self._resource_medicos.request() as request_medico:
             yield request_medico
 
             # Consulta
-            print(f'{self._env.now:04.1f}: Paciente {id_paciente:02d} iniciou sua consulta')
-            yield self._env.timeout(self._rnd.exponential(20))
-            print(f'{self._env.now:04.1f}: Paciente {id_paciente:02d} terminou sua consulta')
-        tempo_consulta_fim = self._env.now
+            self._log(paciente, 'iniciou sua consulta')
+            yield timeout(self._amostrador_consulta.proximo())
+            self._log(paciente, 'terminou sua consulta')
+        tempo_consulta_fim = env.now
         self._tempo_total_consulta += (tempo_consulta_fim - tempo_consulta_inicio)
 
         # Atendimento na recepcionista 2
-        tempo_recepcionista_2_inicio = self._env.now
+        tempo_recepcionista_2_inicio = env.now
         with self._resource_recepcionistas.request() as request_recepcionista:
             # Aguarda recepcionista livre
             yield request_recepcionista
 
             # Efetua pagamento e agenda a próxima consulta
-            print(f'{self._env.now:04.1f}: Paciente {id_paciente:02d} efetua pagamento e agenda próxima consulta')
-            tempo_pagamento_inicio = self._env.now
-            yield self._env.timeout(random.uniform(1, 4))
-            tempo_pagamento_fim = self._env.now
-            print(f'{self._env.now:04.1f}: Paciente {id_paciente:02d} saiu da clínica')
-        tempo_recepcionista_2_fim = self._env.now
+            self._log(paciente, 'efetua pagamento e agenda próxima consulta')
+            tempo_pagamento_inicio = env.now
+            yield timeout(self._amostrador_pagamento.proximo())
+            tempo_pagamento_fim = env.now
+            self._log(paciente, 'saiu da clínica')
+        tempo_recepcionista_2_fim = env.now
         self._tempo_total_recepcionista_2 += (tempo_recepcionista_2_fim - tempo_recepcionista_2_inicio)
 
         # Tempo de pagamento e agendamento
         self._tempo_total_pagamento += (tempo_pagamento_fim - tempo_pagamento_inicio)
 
-        # Atualiza o tempo total
-        tempo_fim = self._env.now
         self._num_eventos += 1
 
     def obter_estatisticas(self):
@@ -113,8 +145,11 @@ class ModeloClinicaMedica:
 
 
 def main() -> None:
+    dados_geral = sd.carrega_configuracao().get('geral', {})
+    deve_exibir_log = dados_geral.get('log', False)
+
     env = simpy.Environment()
-    modelo = ModeloClinicaMedica(env)
+    modelo = ModeloClinicaMedica(env, deve_exibir_log=deve_exibir_log)
     env.process(modelo.inicia())
     env.run(until=3000)
     media_chegada, media_recepcionista_1, media_ficha, media_consulta, media_recepcionista_2, media_pagamento = modelo.obter_estatisticas()
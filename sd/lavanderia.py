@@ -1,7 +1,6 @@
-import functools
 import itertools
-import random
 
+import numpy as np
 import simpy
 import simpy.resources.resource
 
@@ -29,7 +28,23 @@ class ModeloLavanderia(metaclass=sd.ModeloMetaclass):
     _tempos_espera_secadora: list[float] = sd.MetricaModelo(descricao='Tempo espera p/ secar')
     _tempos_secagem: list[float] = sd.MetricaModelo(descricao='Tempo secagem')
 
+    _amostrador_chegada: sd.Amostrador
+    _amostrador_descarga: sd.Amostrador
+    _amostrador_transporte: sd.Amostrador
+    _amostrador_secagem: sd.Amostrador
+
     def executa(self, env: simpy.Environment) -> None:
+        # Distribuições sorteadas em lotes
+        rnd = self._rnd
+        # Chegada média de 10 minutos
+        self._amostrador_chegada = sd.Amostrador(lambda n: rnd.exponential(10, size=n))
+        # Descarga das roupas no cesto entre 1 e 4 minutos
+        self._amostrador_descarga = sd.Amostrador(lambda n: rnd.uniform(1, 4, size=n))
+        # Transporte para a secadora entre 3 e 5 minutos
+        self._amostrador_transporte = sd.Amostrador(lambda n: rnd.uniform(3, 5, size=n))
+        # Secagem em média de 10 minutos, com desvio de 4 minutos
+        self._amostrador_secagem = sd.Amostrador(lambda n: np.abs(rnd.normal(10, scale=4, size=n)))
+
         # Recursos
         self._resource_maquinas = simpy.Resource(env, capacity=self._qtd_lavadoras)
         self._resource_cestos = simpy.Resource(env, capacity=self._qtd_cestos)
@@ -37,16 +52,23 @@ class ModeloLavanderia(metaclass=sd.ModeloMetaclass):
         env.process(self._processa_consumidores(env))
 
     def _processa_consumidores(self, env: simpy.Environment) -> sd.Generator:
+        # Métodos usados a cada cliente, resolvidos uma única vez
+        process = env.process
+        timeout = env.timeout
+        proxima_chegada = self._amostrador_chegada.proximo
+        processo_lavagem = self._processo_lavagem
+
         # Processos de clientes
         for id_consumidor in itertools.count(start=1):
-            env.process(self._processo_lavagem(env, id_consumidor))
+            process(processo_lavagem(env, id_consumidor))
 
             # Chegada média de 10 minutos
-            yield env.timeout(self._rnd.exponential(10))
+            yield timeout(proxima_chegada())
 
     @sd.entrypoint
     def _processo_lavagem(self, env: simpy.Environment, id_consumidor: int) -> sd.Generator:
-        log = functools.partial(self._log, env, f'consumidor {id_consumidor:02d}')
+        log = self._cria_log(env, f'consumidor {id_consumidor:02d}')
+        timeout = env.timeout
 
         log('chega na lavanderia')
         tempo_inicial_estadia_cliente = env.now
@@ -59,7 +81,7 @@ class ModeloLavanderia(metaclass=sd.ModeloMetaclass):
 
             # Utiliza a máquina
             log('utiliza máquina')
-            yield env.timeout(25)
+            yield timeout(25)
             self._tempos_lavagem.append(25)
             log('termina de usar a máquina')
 
@@ -71,10 +93,10 @@ class ModeloLavanderia(metaclass=sd.ModeloMetaclass):
 
             # Descarrega roupas no cesto
             log('descarrega roupas no cesto')
-            yield env.timeout(random.uniform(1, 4))
+            yield timeout(self._amostrador_descarga.proximo())
             # Transporte para a secadora
             log('transporta roupa para a secadora')
-            yield env.timeout(random.uniform(3, 5))
+            yield timeout(self._amostrador_transporte.proximo())
 
         with self._resource_secadoras.request() as request_secadora:
             tempo_inicial_aguarda_secadora = env.now
@@ -84,12 +106,12 @@ class ModeloLavanderia(metaclass=sd.ModeloMetaclass):
 
             # Carrega secadora
             log('carrega a secadora')
-            yield env.timeout(2)
+            yield timeout(2)
             log('termina de carregar a secadora')
 
             # Secagem
             tempo_inicial_secagem = env.now
-            yield env.timeout(abs(self._rnd.normal(10, scale=4)))
+            yield timeout(self._amostrador_secagem.proximo())
             self._tempos_secagem.append(env.now - tempo_inicial_secagem)
             log('termina a secagem')
 
@@ -1,84 +1,80 @@
 import abc
-import dataclasses
-import enum
-import functools
 import typing
 
+import numpy as np
 import simpy
 import simpy.resources.resource
 
 import sd
-from sd import Modelo
 
 
-class _Metrica(enum.Enum):
-    TEMPO_ESPERA_PECAS = 0
-    TEMPO_ESPERA_PARAFUSOS = 1
-    TEMPO_ESPERA_MAQUINA_USINAGEM = 2
-    TEMPO_ESPERA_PECAS_FIXADAS = 3
+class ModeloMontagem(metaclass=sd.ModeloMetaclass):
+    # Configuração do modelo
+    chave_modelo: str = 'montagem'
+    unidade_tempo: str = 'minutos'
 
-
-class ModeloMontagem(sd.Modelo[_Metrica]):
-    @dataclasses.dataclass
-    class _Estatisticas:
-        tempos_espera_pecas: list[float]
-        tempos_espera_parafusos: list[float]
-        tempos_espera_maquina_usinagem: list[float]
-        tempos_espera_pecas_fixadas: list[float]
+    _pecas_fixadas: int = sd.MetricaModelo(descricao='Número de peças fixadas')
+    _pecas_unidas: int = sd.MetricaModelo(descricao='Número de peças unidas')
+    _tempos_espera_pecas: list[float] = sd.MetricaModelo(descricao='Espera p/ receber peças')
+    _tempos_espera_parafusos: list[float] = sd.MetricaModelo(descricao='Espera p/ receber parafusos')
+    _tempos_espera_maquina_usinagem: list[float] = sd.MetricaModelo(descricao='Espera p/ liberar máquina')
+    _tempos_espera_pecas_fixadas: list[float] = sd.MetricaModelo(descricao='Espera p/ receber peças unidas')
 
     _resource_maquina: simpy.Resource
     _container_pecas: simpy.Container
     _container_parafusos: simpy.Container
     _container_pecas_fixadas: simpy.Container
 
-    _pecas_fixadas: int
-    _pecas_unidas: int
-    _estatisticas: _Estatisticas
-
-    def __init__(self, *, deve_exibir_log: bool = False, seed: int | None = None) -> None:
-        super().__init__(
-            deve_exibir_log=deve_exibir_log,
-            seed=seed,
-        )
+    _amostrador_abastecimento: sd.Amostrador
+    _amostrador_parafusos: sd.Amostrador
+    _amostrador_fixacao: sd.Amostrador
+    _amostrador_uniao: sd.Amostrador
 
     def _monitora(self, env: simpy.Environment) -> sd.Generator:
         while True:
             # A célula é abastecida em média a cada 40 minutos,
             # normalmente distribuído com desvio de 3min...
-            yield env.timeout(abs(self._rnd.normal(40, scale=3)))
+            yield env.timeout(self._amostrador_abastecimento.proximo())
 
             # ...por pallets com 60 peças...
-            yield self._container_pecas.put(60 - self._container_pecas.level)
+            qtd_pecas = 60 - self._container_pecas.level
+            # (um `put` vazio não é aceito pelo SimPy, então só abastece se houver peças faltando)
+            if qtd_pecas > 0:
+                yield self._container_pecas.put(qtd_pecas)
             # ...e caixas de parafusos que contêm de 990 a 1.010 unidades
-            qtd_parafusos = max(self._rnd.integers(990, 1010), self._container_parafusos.level) - self._container_parafusos.level
+            nivel_parafusos = self._container_parafusos.level
+            qtd_parafusos = max(self._amostrador_parafusos.proximo(), nivel_parafusos) - nivel_parafusos
             if qtd_parafusos > 0:
                 yield self._container_parafusos.put(qtd_parafusos)
 
+    # As atividades abaixo são executadas no próprio processo do funcionário (via `yield from`),
+    # em vez de em um novo processo do SimPy, já que ele apenas espera por elas
     def _fixa_pecas(self, env: simpy.Environment) -> sd.Generator:
         # [Atividade] Fixa peças
         # A fixação das peças antes da usinagem é feita em um tempo médio
         # de 40 segundos, normalmente distribuído, com desvio-padrão de 5
         # segundos
-        yield env.timeout(abs(self._rnd.normal(40 / 60, scale=5 / 60)))
+        yield env.timeout(self._amostrador_fixacao.proximo())
         self._pecas_fixadas += 1
 
     def _une_pecas(self, env: simpy.Environment) -> sd.Generator:
         # [Atividade] Une peças
         # A união das peças por parafusos gasta entre 3,5 e 4 minutos,
         # segundo uma distribuição uniforme
-        yield env.timeout(self._rnd.uniform(low=3.5, high=4))
+        yield env.timeout(self._amostrador_uniao.proximo())
         self._pecas_unidas += 1
 
-    @typing.override
-    def inicia(self, env: simpy.Environment) -> None:
-        self._pecas_unidas = 0
-        self._pecas_fixadas = 0
-        self._estatisticas = ModeloMontagem._Estatisticas(
-            tempos_espera_pecas=[],
-            tempos_espera_parafusos=[],
-            tempos_espera_maquina_usinagem=[],
-            tempos_espera_pecas_fixadas=[],
-        )
+    def executa(self, env: simpy.Environment) -> None:
+        # Distribuições sorteadas em lotes
+        rnd = self._rnd
+        # A célula é abastecida em média a cada 40 minutos, normalmente distribuído com desvio de 3min
+        self._amostrador_abastecimento = sd.Amostrador(lambda n: np.abs(rnd.normal(40, scale=3, size=n)))
+        # Caixas de parafusos que contêm de 990 a 1.010 unidades
+        self._amostrador_parafusos = sd.Amostrador(lambda n: rnd.integers(990, 1010, size=n))
+        # A fixação das peças é feita em média em 40 segundos, com desvio-padrão de 5 segundos
+        self._amostrador_fixacao = sd.Amostrador(lambda n: np.abs(rnd.normal(40 / 60, scale=5 / 60, size=n)))
+        # A união das peças gasta entre 3,5 e 4 minutos, segundo uma distribuição uniforme
+        self._amostrador_uniao = sd.Amostrador(lambda n: rnd.uniform(low=3.5, high=4, size=n))
 
         # A máquina de usinagem
         self._resource_maquina = simpy.Resource(env, capacity=1)
@@ -92,20 +88,6 @@ class ModeloMontagem(sd.Modelo[_Metrica]):
         env.process(self._monitora(env))
         self._executa(env)
 
-    @typing.override
-    def calcula_metrica(self, metrica: _Metrica) -> list[float]:
-        match metrica:
-            case _Metrica.TEMPO_ESPERA_PECAS:
-                return self._estatisticas.tempos_espera_pecas
-            case _Metrica.TEMPO_ESPERA_PARAFUSOS:
-                return self._estatisticas.tempos_espera_parafusos
-            case _Metrica.TEMPO_ESPERA_MAQUINA_USINAGEM:
-                return self._estatisticas.tempos_espera_maquina_usinagem
-            case _Metrica.TEMPO_ESPERA_PECAS_FIXADAS:
-                return self._estatisticas.tempos_espera_pecas_fixadas
-            case _:
-                typing.assert_never(metrica)
-
     @abc.abstractmethod
     def _executa(self, env: simpy.Environment) -> None:
         pass
@@ -119,47 +101,58 @@ class ModeloMontagem1(ModeloMontagem):
             env.process(self._executa_funcionario_2(env))
 
     def _executa_funcionario_1(self, env: simpy.Environment) -> typing.Generator[simpy.Event, None, None]:
-        log = functools.partial(self._log, env, 'funcionário 1')
+        log = self._cria_log(env, 'funcionário 1')
+        # Métodos usados a cada iteração, resolvidos uma única vez
+        get_pecas = self._container_pecas.get
+        put_pecas_fixadas = self._container_pecas_fixadas.put
+        request_maquina_usinagem = self._resource_maquina.request
+        registra_espera_pecas = self._tempos_espera_pecas.append
+        registra_espera_maquina = self._tempos_espera_maquina_usinagem.append
         while True:
             # (Fila) Aguarda ao menos 2 peças
             tempo_inicial_espera_pecas = env.now
-            yield self._container_pecas.get(2)
+            yield get_pecas(2)
             log('obtém pares de peças')
-            self._estatisticas.tempos_espera_pecas.append(env.now - tempo_inicial_espera_pecas)
+            registra_espera_pecas(env.now - tempo_inicial_espera_pecas)
 
-            yield env.process(self._fixa_pecas(env))
+            yield from self._fixa_pecas(env)
             log('fixa peças')
 
-            with self._resource_maquina.request() as request_maquina:
+            with request_maquina_usinagem() as request_maquina:
                 tempo_inicial_espera_maquina = env.now
                 # (Fila) Aguarda máquina
                 yield request_maquina
-                self._estatisticas.tempos_espera_maquina_usinagem.append(env.now - tempo_inicial_espera_maquina)
+                registra_espera_maquina(env.now - tempo_inicial_espera_maquina)
 
                 log('inicia usinagem')
                 # [Atividade] Executa usinagem
                 yield env.timeout(3)
                 log('termina usinagem')
 
-            yield self._container_pecas_fixadas.put(2)
+            yield put_pecas_fixadas(2)
 
     def _executa_funcionario_2(self, env: simpy.Environment) -> typing.Generator[simpy.Event, None, None]:
-        log = functools.partial(self._log, env, 'funcionário 2')
+        log = self._cria_log(env, 'funcionário 2')
+        # Métodos usados a cada iteração, resolvidos uma única vez
+        get_pecas_fixadas = self._container_pecas_fixadas.get
+        get_parafusos = self._container_parafusos.get
+        registra_espera_pecas_fixadas = self._tempos_espera_pecas_fixadas.append
+        registra_espera_parafusos = self._tempos_espera_parafusos.append
         while True:
             # Aguarda peças fixadas
             tempo_inicial_espera_pecas_fixadas = env.now
-            yield self._container_pecas_fixadas.get(2)
+            yield get_pecas_fixadas(2)
             log('recebe peças fixadas')
-            self._estatisticas.tempos_espera_pecas_fixadas.append(env.now - tempo_inicial_espera_pecas_fixadas)
+            registra_espera_pecas_fixadas(env.now - tempo_inicial_espera_pecas_fixadas)
 
             # (Fila) Aguarda ao menos 4 parafusos
             # Outro empregado une os pares de peças com 4 parafusos
             tempo_inicial_espera_parafusos = env.now
-            yield self._container_parafusos.get(4)
+            yield get_parafusos(4)
             log('recebe parafusos')
-            self._estatisticas.tempos_espera_parafusos.append(env.now - tempo_inicial_espera_parafusos)
+            registra_espera_parafusos(env.now - tempo_inicial_espera_parafusos)
 
-            yield env.process(self._une_pecas(env))
+            yield from self._une_pecas(env)
             log('une peças')
 
 
@@ -174,13 +167,13 @@ class ModeloMontagem2(ModeloMontagem):
             env.process(self._executa_uniao(env))
 
     def _executa_fixacao(self, env: simpy.Environment) -> typing.Generator[simpy.Event, None, None]:
-        log = functools.partial(self._log, env, 'funcionário')
+        log = self._cria_log(env, 'funcionário')
         while True:
             # (Fila) Aguarda ao menos 2 peças
             yield self._container_pecas.get(2)
             log('obtém pares de peças')
 
-            yield env.process(self._fixa_pecas(env))
+            yield from self._fixa_pecas(env)
             log('fixa peças')
 
             with self._resource_maquina.request() as request_maquina:
@@ -198,55 +191,21 @@ class ModeloMontagem2(ModeloMontagem):
             yield self._container_pecas_fixadas.put(2)
 
     def _executa_uniao(self, env: simpy.Environment) -> typing.Generator[simpy.Event, None, None]:
+        log = self._cria_log(env)
         while True:
             # Apenas durante usinagem
             yield self._evento_usinagem
 
             # (Fila) Aguarda ao menos 4 parafusos
             yield self._container_parafusos.get(4)
-            self._log(env, 'F1 obtém peças fixadas')
-
-            yield env.process(self._une_pecas(env))
-            self._log(env, 'F1 une peças')
-
-
-class ExecutorModeloMontagem(sd.ExecutorModelo[_Metrica]):
-    def inicializa_modelo(
-            self,
-            dados_modelos: dict[str, dict[str, typing.Any]],
-            seed: int | None,
-            deve_exibir_log: bool,
-    ) -> Modelo[_Metrica]:
-        return ModeloMontagem1(deve_exibir_log=deve_exibir_log, seed=seed)
-
-    def lista_metricas(self) -> typing.Sequence[_Metrica]:
-        return list(_Metrica)
-
-    def exibe_modelo_executado(self, modelo: Modelo[_Metrica]) -> None:
-        for metrica in self.lista_metricas():
-            valores = modelo.calcula_metrica(metrica)
-            label = self.descreve_metrica(metrica)
-            self._log_stats(label, valores, time_unit='minutes')
-
-    def descreve_metrica(self, metrica: _Metrica) -> str:
-        match metrica:
-            case _Metrica.TEMPO_ESPERA_PECAS:
-                return 'Espera p/ receber peças'
-            case _Metrica.TEMPO_ESPERA_PARAFUSOS:
-                return 'Espera p/ receber parafusos'
-            case _Metrica.TEMPO_ESPERA_MAQUINA_USINAGEM:
-                return 'Espera p/ liberar máquina'
-            case _Metrica.TEMPO_ESPERA_PECAS_FIXADAS:
-                return 'Espera p/ receber peças unidas'
-            case _:
-                typing.assert_never(metrica)
-
-    modelo: ModeloMontagem
+            log('F1 obtém peças fixadas')
+
+            yield from self._une_pecas(env)
+            log('F1 une peças')
 
 
 def main() -> None:
-    executor = ExecutorModeloMontagem()
-    sd.executa_script(executor, x_range=(30, 8 * 60 + 30, 60), y_range=(0, 30, 5))
+    sd.executa_script(ModeloMontagem1, x_range=(30, 8 * 60 + 30, 60), y_range=(0, 30, 5))
 
 
 if __name__ == '__main__':